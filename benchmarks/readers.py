@@ -0,0 +1,297 @@
+"""
+Benchmark compile time and memory of programs with increasing numbers of reads.
+
+Programs are synthesized with reads cycling through the six readers, each read being one of
+`get()`, `exists(store=False)`, `exists(store=True)` and `get()` loading a value cached by the
+latter. Every size is compiled in a fresh process, recording per phase:
+
+- construct: building the reader expressions
+- lower: `__teal__` lowering of the program and its subroutines
+- slots: scratch slot assignment
+- flatten: sorting, resolving and flattening the blocks of each subroutine
+- other: the rest of `compileTeal` (version and mode checks, assembly of the output), for which
+  no peak is recorded
+
+Wall time is measured first, followed by a second compile tracing allocations (peak and net
+bytes per phase) with tracemalloc. Peak RSS of the process is measured after the first compile.
+The report is written as JSON and can be compared with the report of another version, printing
+the ratio of every measure.
+
+Sizes exceeding the timeout are reported as failures, along with the larger sizes which are skipped.
+
+Usage: `poetry run python benchmarks/readers.py [--sizes N ...] [--timeout SECONDS] [--output FILE]
+[--compare FILE]`
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import typing
+from importlib import metadata
+
+import pyteal as pt
+import pyteal.compiler.compiler as compiler
+
+import pyteal_maybenot as ptmn
+
+VERSION = 7
+SIZES = [10, 100, 1000, 10000, 100000]
+# readers caching values, limited by the number of scratch slots
+CACHED = 128
+# PyTeal recurses once per block when linking and sorting blocks
+RECURSION_LIMIT = 1_000_000
+STACK_SIZE = 512 * 2**20
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ["construct", "lower", "slots", "flatten", "other"]
+
+_READERS: list[typing.Callable[[int], typing.Any]] = [
+    lambda i: ptmn.AssetHolding(pt.Txn.accounts[i % 4], pt.Txn.assets[i % 8], "balance"),
+    lambda i: ptmn.AssetParams(pt.Txn.assets[i % 8], "decimals"),
+    lambda i: ptmn.AppParams(pt.Txn.applications[i % 8], "global_num_uint"),
+    lambda i: ptmn.AcctParams(pt.Txn.accounts[i % 4], "balance"),
+    lambda i: ptmn.ExAppGlobal(pt.Txn.applications[i % 8], pt.Bytes(f"key{i}"), pt.TealType.uint64),
+    lambda i: ptmn.ExAppLocal(pt.Txn.sender(), pt.Txn.applications[i % 8], pt.Bytes(f"key{i}"), pt.TealType.uint64),
+]
+
+
+def synthesize(reads: int) -> pt.Expr:
+    """Program performing the given number of reads."""
+    cached = [_READERS[i % len(_READERS)](i) for i in range(min(CACHED, reads))]
+    exprs: list[pt.Expr] = []
+    for i in range(reads):
+        match i % 4:
+            case 0:
+                exprs.append(pt.Pop(_READERS[i % len(_READERS)](i).get()))
+            case 1:
+                exprs.append(pt.Pop(_READERS[i % len(_READERS)](i).exists(store=False)))
+            case 2 if (reader := cached[i // 4 % len(cached)]).scratch is None:
+                exprs.append(pt.Pop(reader.exists(store=True)))
+            case _:
+                # cache hit, or a cached read of a reader already checked
+                exprs.append(pt.Pop(cached[i // 4 % len(cached)].get()))
+    return pt.Seq(*exprs, pt.Int(1))
+
+
+class _Phases:
+    """Wrap the functions called by compileTeal to measure each phase."""
+
+    # phase of each function, looked up by compileTeal in the module namespace
+    FUNCTIONS = {
+        "compileSubroutine": "lower",
+        "assignScratchSlotsToSubroutines": "slots",
+        "sort_subroutine_blocks": "flatten",
+        "resolveSubroutines": "flatten",
+        "flattenSubroutines": "flatten",
+    }
+
+    def __init__(self, trace: bool):
+        self.trace = trace
+        self.results = {phase: {"seconds": 0.0, "peak_bytes": 0, "net_bytes": 0} for phase in PHASES}
+        self._active: str | None = None
+
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        # subroutines are lowered by recursive calls, measured as part of the outermost call
+        if self._active:
+            yield
+            return
+        self._active = phase
+        if self.trace:
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active = None
+            result = self.results[phase]
+            result["seconds"] += time.perf_counter() - start
+            if self.trace:
+                current, peak = tracemalloc.get_traced_memory()
+                result["peak_bytes"] = max(result["peak_bytes"], peak - start_bytes)
+                result["net_bytes"] += current - start_bytes
+
+    def _wrap(self, function: typing.Callable, phase: str) -> typing.Callable:
+        def wrapped(*args, **kwargs):
+            with self.measure(phase):
+                return function(*args, **kwargs)
+
+        return wrapped
+
+    @contextlib.contextmanager
+    def patch(self):
+        originals = {name: getattr(compiler, name) for name in self.FUNCTIONS}
+        for name, phase in self.FUNCTIONS.items():
+            setattr(compiler, name, self._wrap(originals[name], phase))
+        try:
+            yield
+        finally:
+            for name, function in originals.items():
+                setattr(compiler, name, function)
+
+
+def _compile(reads: int, trace: bool) -> tuple[dict, int]:
+    phases = _Phases(trace)
+    if trace:
+        tracemalloc.start()
+    try:
+        with phases.measure("construct"):
+            program = synthesize(reads)
+        start_bytes = tracemalloc.get_traced_memory()[0] if trace else 0
+        start = time.perf_counter()
+        with phases.patch():
+            teal = pt.compileTeal(program, mode=pt.Mode.Application, version=VERSION)
+        seconds = time.perf_counter() - start
+        net_bytes = tracemalloc.get_traced_memory()[0] - start_bytes if trace else 0
+    finally:
+        if trace:
+            tracemalloc.stop()
+    # the rest of compileTeal, the peak of which is not measured separately
+    measured = [phases.results[phase] for phase in ["lower", "slots", "flatten"]]
+    phases.results["other"] = {
+        "seconds": seconds - sum(result["seconds"] for result in measured),
+        "peak_bytes": 0,
+        "net_bytes": net_bytes - sum(result["net_bytes"] for result in measured),
+    }
+    return phases.results, teal.count("\n")
+
+
+def measure(reads: int) -> dict:
+    """Measure a single size, see the module documentation."""
+    timed, ops = _compile(reads, trace=False)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    traced, _ = _compile(reads, trace=True)
+    return {
+        "reads": reads,
+        "ops": ops,
+        "peak_rss_bytes": rss,
+        "phases": {
+            phase: {"seconds": timed[phase]["seconds"], **{k: v for k, v in traced[phase].items() if k != "seconds"}}
+            for phase in PHASES
+        },
+    }
+
+
+def _growth(results: list[dict], phase: str) -> list[float | None]:
+    """Exponent of the growth in time between consecutive sizes, e.g. 1 for linear and 2 for quadratic."""
+    growth: list[float | None] = [None]
+    for prev, result in zip(results, results[1:]):
+        before, after = prev["phases"][phase]["seconds"], result["phases"][phase]["seconds"]
+        if before <= 0 or after <= 0:
+            growth.append(None)
+        else:
+            growth.append(math.log(after / before) / math.log(result["reads"] / prev["reads"]))
+    return growth
+
+
+def _print_report(report: dict):
+    results = report["results"]
+    print(f"{'reads':>8} {'ops':>8} {'rss MB':>8}  " + "  ".join(f"{phase:>18}" for phase in PHASES))
+    growth = {phase: _growth(results, phase) for phase in PHASES}
+    for i, result in enumerate(results):
+        cells = []
+        for phase in PHASES:
+            seconds = result["phases"][phase]["seconds"]
+            exponent = growth[phase][i]
+            cells.append(f"{seconds:>9.4f}s" + (f" (^{exponent:4.2f})" if exponent is not None else " " * 8))
+        print(f"{result['reads']:>8} {result['ops']:>8} {result['peak_rss_bytes'] / 2**20:>8.1f}  " + "  ".join(cells))
+    for failure in report["failures"]:
+        print(f"{failure['reads']:>8} {failure['error']}")
+
+
+def _print_comparison(report: dict, baseline: dict):
+    print(f"\nratio to {baseline['version']} (time / peak traced bytes)")
+    previous = {result["reads"]: result for result in baseline["results"]}
+    for result in report["results"]:
+        if (other := previous.get(result["reads"])) is None:
+            continue
+        cells = []
+        for phase in PHASES:
+            now, then = result["phases"][phase], other["phases"][phase]
+            time_ratio = now["seconds"] / then["seconds"] if then["seconds"] > 0 else math.nan
+            peak_ratio = now["peak_bytes"] / then["peak_bytes"] if then["peak_bytes"] > 0 else math.nan
+            cells.append(f"{phase} {time_ratio:.2f} / {peak_ratio:.2f}")
+        print(f"{result['reads']:>8}  " + "  ".join(cells))
+
+
+def _version() -> str:
+    """Version of the package benchmarked, described by git if available."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], check=True, capture_output=True, text=True, cwd=_ROOT
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return metadata.version("pyteal-maybenot")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python benchmarks/readers.py", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, metavar="N", help="numbers of reads")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per size (default 600)")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--compare", metavar="FILE", help="report of another version to compare with")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        # measure a single size in this process and print the result for the parent process, on a
+        # thread with a larger stack as PyTeal recurses over the blocks of the program
+        sys.setrecursionlimit(RECURSION_LIMIT)
+        threading.stack_size(STACK_SIZE)
+        thread = threading.Thread(target=lambda: print(json.dumps(measure(args.single))))
+        thread.start()
+        thread.join()
+        return 0
+
+    results: list[dict] = []
+    failures: list[dict] = []
+    sizes = sorted(args.sizes)
+    for i, size in enumerate(sizes):
+        try:
+            process = subprocess.run(
+                [sys.executable, __file__, "--single", str(size)], capture_output=True, text=True, timeout=args.timeout
+            )
+        except subprocess.TimeoutExpired:
+            # larger sizes would time out as well
+            failures.extend({"reads": n, "error": f"timed out after {args.timeout}s"} for n in sizes[i:])
+            print(f"timed out at {size} reads, skipping larger sizes", file=sys.stderr)
+            break
+        if process.returncode != 0 or not process.stdout:
+            # keep measuring the other sizes, the failure is part of the report
+            error = (process.stderr.strip().splitlines() or [f"exit status {process.returncode}"])[-1]
+            failures.append({"reads": size, "error": error})
+            print(f"failed {size} reads: {error}", file=sys.stderr)
+            continue
+        results.append(json.loads(process.stdout))
+        print(f"measured {size} reads", file=sys.stderr)
+
+    report = {
+        "version": _version(),
+        "pyteal": metadata.version("pyteal"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "recursion_limit": RECURSION_LIMIT,
+        "results": results,
+        "failures": failures,
+    }
+    _print_report(report)
+    if args.compare:
+        with open(args.compare) as f:
+            _print_comparison(report, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,9 @@
+from .expr.combinators import all_exist, any_exist
 from .expr.ex import ExAppGlobal, ExAppLocal
+from .expr.flags import FlagCache
 from .expr.params import AcctParams, AppParams, AssetHolding, AssetParams
+from .expr.policy import CacheDecision, CachePolicy
+from .footprint import ProgramFootprint, ResourceFootprint, SubroutineFootprint, collect_footprint
+from .group import verify_group
+from .metrics import ProgramMetrics, ReaderMetrics, collect_metrics
+from .template import Template
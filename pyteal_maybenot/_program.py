@@ -0,0 +1,21 @@
+import os
+import sys
+import typing
+
+
+def compile_file(source: str, path: str, name: str, mode: str, version: int, assemble_constants: bool = False) -> str:
+    """Execute the source of a Python file and compile the program returned by the named function."""
+    import pyteal as pt
+
+    namespace: dict[str, typing.Any] = {"__name__": "__pyteal_maybenot__", "__file__": path}
+    # allow importing modules next to the file, as when running it as a script
+    directory = os.path.dirname(os.path.abspath(path))
+    sys.path.insert(0, directory)
+    try:
+        exec(compile(source, path, "exec"), namespace)
+    finally:
+        sys.path.remove(directory)
+    program = namespace[name]()
+    return pt.compileTeal(
+        program, mode=pt.Mode[mode.capitalize()], version=version, assembleConstants=assemble_constants
+    )
@@ -0,0 +1,189 @@
+"""
+Compile PyTeal programs in a long-running local process, keeping the libraries imported between builds.
+
+The server listens on a Unix socket for compile requests, each naming a Python file and a function
+in it returning the program, along with the compile options. The file is executed again for every
+request (modules it imports stay loaded), and the compiled program is reused as long as the file
+and the options are unchanged.
+
+As requests execute arbitrary files, the socket is only accessible by the user running the server,
+and is placed in `$XDG_RUNTIME_DIR` (or a private directory in the temporary directory) by default.
+
+Requests and responses are single lines of JSON, one request per connection:
+
+- request: `{"file": ..., "name": ..., "mode": "application", "version": 7, "assemble_constants": false}`,
+  where file is an absolute path (resolved by the client, as the server runs in another directory)
+- response: `{"teal": ..., "cached": false}` or `{"error": ...}`
+
+Usage: `python -m pyteal_maybenot.daemon [--socket PATH] serve` to start the server, and
+`python -m pyteal_maybenot.daemon [--socket PATH] compile [--mode MODE] [--version VERSION]
+[--assemble-constants] FILE NAME` to print the program compiled by the server.
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+
+from ._program import compile_file
+
+# the runtime directory is private to the user, otherwise a private directory is created on first use
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"pyteal-maybenot-{os.getuid()}"),
+    "pyteal-maybenot.sock",
+)
+
+
+def _check_private(path: str, directory: bool):
+    """Check that a path is owned by the user and cannot be modified by anyone else."""
+    info = os.lstat(path)
+    if not (stat.S_ISDIR(info.st_mode) if directory else stat.S_ISSOCK(info.st_mode)):
+        raise ValueError(f"{path} is not a {'directory' if directory else 'socket'}")
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise ValueError(f"{path} must be owned by the current user and not writable by others")
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """Unix socket server compiling the programs of the requests received, one at a time."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        # other users must not be able to replace the socket, as requests execute arbitrary files
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        _check_private(directory, directory=True)
+        # remove the socket of a previous server which was not shut down cleanly
+        if os.path.lexists(path):
+            _check_private(path, directory=False)
+            os.unlink(path)
+        super().__init__(path, _CompileHandler)
+        # compiled programs by file, name and options, along with the digest of the file compiled
+        self._cache: dict[tuple, tuple[str, str]] = {}
+
+    def compile(self, request: object) -> dict:
+        """Compile the program of a request, returning the response."""
+        if not isinstance(request, dict):
+            return {"error": "Invalid request: expected a JSON object"}
+        path = request.get("file")
+        name = request.get("name")
+        mode = request.get("mode", "application")
+        version = request.get("version", 7)
+        assemble_constants = request.get("assemble_constants", False)
+        if not (
+            isinstance(path, str)
+            and isinstance(name, str)
+            and isinstance(mode, str)
+            and isinstance(version, int)
+            and isinstance(assemble_constants, bool)
+        ):
+            return {
+                "error": "Invalid request: file, name and mode must be strings, version an integer and "
+                "assemble_constants a boolean"
+            }
+        if not os.path.isabs(path):
+            # relative to the working directory of the client, which the server does not know
+            return {"error": "Invalid request: file must be an absolute path"}
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except OSError as e:
+            return {"error": f"Invalid request: {e!r}"}
+
+        key = (path, name, mode, version, assemble_constants)
+        digest = hashlib.sha256(source).hexdigest()
+        if (entry := self._cache.get(key)) and entry[0] == digest:
+            return {"teal": entry[1], "cached": True}
+
+        try:
+            teal = compile_file(source.decode(), path, name, mode, version, assemble_constants)
+        except Exception as e:
+            return {"error": f"{e.__class__.__name__}: {e}"}
+        self._cache[key] = (digest, teal)
+        return {"teal": teal, "cached": False}
+
+    def server_bind(self):
+        # only the user may connect, without leaving a window where the socket is accessible
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)  # type: ignore[arg-type]
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):  # type: ignore[arg-type]
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+
+
+class _CompileHandler(socketserver.StreamRequestHandler):
+    server: CompileServer
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError as e:
+            response = {"error": f"Invalid request: {e}"}
+        else:
+            response = self.server.compile(request)
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def request(request: dict, path: str = DEFAULT_SOCKET) -> dict:
+    """Send a compile request to the server listening on the given socket, returning the response."""
+    # do not send requests to a server of another user
+    _check_private(path, directory=False)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile("rwb") as f:
+            f.write(json.dumps(request).encode() + b"\n")
+            f.flush()
+            return json.loads(f.readline())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pyteal_maybenot.daemon", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"path of the Unix socket (default {DEFAULT_SOCKET})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="start the server")
+    compile_parser = commands.add_parser("compile", help="print the program compiled by the server")
+    compile_parser.add_argument("file", metavar="FILE")
+    compile_parser.add_argument("name", metavar="NAME", help="function returning the program to compile")
+    compile_parser.add_argument("--mode", choices=["application", "signature"], default="application")
+    compile_parser.add_argument("--version", type=int, default=7)
+    compile_parser.add_argument("--assemble-constants", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        with CompileServer(args.socket) as server:
+            print(f"Listening on {args.socket}", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    response = request(
+        {
+            "file": os.path.abspath(args.file),
+            "name": args.name,
+            "mode": args.mode,
+            "version": args.version,
+            "assemble_constants": args.assemble_constants,
+        },
+        args.socket,
+    )
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 1
+    print(response["teal"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
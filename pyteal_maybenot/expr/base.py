@@ -0,0 +1,379 @@
+import contextvars
+import typing
+from abc import ABC, abstractmethod
+
+import pyteal as pt
+from pyteal.config import NUM_SLOTS
+from pyteal.types import require_type
+
+from .flags import FlagCache, _StoreFlag
+
+if typing.TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+    from .policy import CachePolicy
+
+
+# callbacks invoked whenever a reader expression is lowered, and whether they are invoked with
+# subroutine calls as well, see `observe`
+_observers: contextvars.ContextVar[
+    tuple[tuple[typing.Callable[[pt.Expr, "CompileOptions"], None], bool], ...]
+] = contextvars.ContextVar("observers", default=())
+
+
+# number of observers registered with calls enabled, and the lowering of subroutine calls replaced
+# while there are any
+_calls = 0
+_subroutine_call_teal: typing.Callable | None = None
+
+
+def _subroutine_call_notify(self: pt.SubroutineCall, options: "CompileOptions"):
+    _notify(self, options)
+    return typing.cast(typing.Callable, _subroutine_call_teal)(self, options)
+
+
+def observe(callback: typing.Callable[[pt.Expr, "CompileOptions"], None], calls: bool = False) -> contextvars.Token:
+    """
+    Register a callback invoked with every reader expression (and its compile options) lowered in
+    the current context, as well as every `pt.SubroutineCall` if calls is enabled. Returns a token
+    to pass to `unobserve`.
+
+    Reader expressions notify the observers themselves, while subroutine calls are notified by
+    wrapping `pt.SubroutineCall.__teal__` as long as an observer with calls enabled is registered.
+    """
+    global _calls, _subroutine_call_teal
+    if calls:
+        if not _calls:
+            _subroutine_call_teal = pt.SubroutineCall.__teal__
+            pt.SubroutineCall.__teal__ = _subroutine_call_notify  # type: ignore[method-assign]
+        _calls += 1
+    return _observers.set(_observers.get() + ((callback, calls),))
+
+
+def unobserve(token: contextvars.Token):
+    global _calls
+    previous = token.old_value if token.old_value is not contextvars.Token.MISSING else ()
+    removed = _observers.get()[len(previous) :]
+    _observers.reset(token)
+    if removed_calls := sum(1 for _, calls in removed if calls):
+        _calls -= removed_calls
+        if not _calls:
+            pt.SubroutineCall.__teal__ = _subroutine_call_teal  # type: ignore[method-assign, assignment]
+
+
+def _notify(expr: pt.Expr, options: "CompileOptions"):
+    call = isinstance(expr, pt.SubroutineCall)
+    for callback, calls in _observers.get():
+        if calls or not call:
+            callback(expr, options)
+
+
+_T = typing.TypeVar("_T")
+
+
+class _Programs(typing.Generic[_T]):
+    """State kept by an observer for every program compiled, in order of compilation."""
+
+    def __init__(self, factory: typing.Callable[[], _T]):
+        self.programs: list[_T] = []
+        self._factory = factory
+        # compile options are created once per compileTeal call, so they identify the program
+        self._options: dict[int, tuple["CompileOptions", _T]] = {}
+
+    def get(self, options: "CompileOptions") -> _T:
+        """State of the program compiled with the given options, created on first use."""
+        if (entry := self._options.get(id(options))) is None:
+            # keep a reference to the options so the id is not reused by another program
+            entry = self._options[id(options)] = (options, self._factory())
+            self.programs.append(entry[1])
+        return entry[1]
+
+
+class _Getter(pt.Expr, ABC):
+    """
+    Get external state (app_global_get_ex, app_local_get_ex, asset_holding_get, asset_params_get,
+    app_params_get, acct_params_get).
+
+    Used over PyTeal MaybeValue implementation because this wastes a lot of operations on storing
+    and loading into ScratchVars, even when branching is not required. This implementation just
+    asserts or pops the first value directly (denoting existence of the field) and then leaves the
+    resulting value on the stack, or alternatively retrives the existence flag alone (while
+    optionally storing the value).
+    """
+
+    op: pt.Op
+
+    def __init__(
+        self,
+        assert_exists: bool = True,
+        get_exists: bool = False,
+        slot: pt.ScratchSlot | None = None,
+        *args: pt.Expr,
+    ):
+        super().__init__()
+
+        if assert_exists and get_exists:
+            raise ValueError("Cannot assert and return exists flag simultaneously")
+
+        self._slot = slot
+        self._args = args
+        self._assert_exists = assert_exists
+        self._get_exists = get_exists
+
+    def _immediates(self) -> list[str]:
+        """Immediate arguments of the op, e.g. the field name."""
+        return []
+
+    def _value_type(self) -> pt.TealType:
+        return pt.TealType.anytype
+
+    def _describe(self) -> str:
+        return ""
+
+    def _read(self, options: "CompileOptions") -> tuple[pt.TealBlock, pt.TealSimpleBlock]:
+        _notify(self, options)
+        # push [value, value_exists] on the stack
+        get_state = pt.TealOp(self, self.op, *self._immediates())
+        return pt.TealSimpleBlock.FromOp(options, get_state, *self._args)
+
+    def __teal__(self, options: "CompileOptions"):
+        get_start, get_end = self._read(options)
+        # need to swap if returning exists flag
+        if self._get_exists:
+            swap = pt.TealSimpleBlock(
+                [
+                    pt.TealOp(self, pt.Op.swap),
+                    # if opting not to store, the value simply gets popped
+                    pt.TealOp(self, pt.Op.store, self._slot) if self._slot else pt.TealOp(self, pt.Op.pop),
+                ]
+            )
+            get_end.setNextBlock(swap)
+            return get_start, swap
+        # we assert that the value_exists (1 if exists, 0 if not), or simply pop it if assert_exists is false
+        value_exists_op = pt.Op.assert_ if self._assert_exists else pt.Op.pop
+        value_start, value_end = pt.TealSimpleBlock.FromOp(options, pt.TealOp(self, value_exists_op))
+        get_end.setNextBlock(value_start)
+        # if storing, the value is cached instead of being left on the stack
+        if self._slot:
+            store = pt.TealSimpleBlock([pt.TealOp(self, pt.Op.store, self._slot)])
+            value_end.setNextBlock(store)
+            return get_start, store
+        return get_start, value_end
+
+    def __str__(self):
+        return f"({self.__class__.__name__} ({self._describe()}assert={self._assert_exists},get_exists={self._get_exists},slot={None if not self._slot else self._slot.id}))"
+
+    def type_of(self):
+        if self._get_exists:
+            return pt.TealType.uint64
+        if self._slot:
+            return pt.TealType.none
+        return self._value_type()
+
+    def has_return(self) -> bool:
+        return False
+
+
+class _GetOr(pt.Expr):
+    """
+    Get external state, or a default value if it does not exist.
+
+    Branches directly on the existence flag left on the stack, jumping past the default if the
+    value exists. Neither path needs to store the value or jump back to join the other.
+    """
+
+    def __init__(self, getter: _Getter, default: pt.Expr):
+        super().__init__()
+
+        if (value_type := getter.type_of()) != pt.TealType.anytype:
+            require_type(default, value_type)
+
+        self._getter = getter
+        self._default = default
+
+    def __teal__(self, options: "CompileOptions"):
+        # [value, value_exists] -> [value] if value exists
+        get_start, get_end = self._getter._read(options)
+        end = pt.TealSimpleBlock([])
+        branch = pt.TealConditionalBlock([])
+        branch.setTrueBlock(end)
+        # [value, value_exists] -> [default] otherwise
+        missing = pt.TealSimpleBlock([pt.TealOp(self, pt.Op.pop)])
+        branch.setFalseBlock(missing)
+        default_start, default_end = self._default.__teal__(options)
+        get_end.setNextBlock(branch)
+        missing.setNextBlock(default_start)
+        default_end.setNextBlock(end)
+        return get_start, end
+
+    def __str__(self):
+        return f"({self.__class__.__name__} {self._getter} {self._default})"
+
+    def type_of(self):
+        if (value_type := self._getter.type_of()) != pt.TealType.anytype:
+            return value_type
+        return self._default.type_of()
+
+    def has_return(self) -> bool:
+        return False
+
+
+class _CachedLoad(pt.Expr):
+    """Load a value cached by an existence check."""
+
+    def __init__(self, scratch: pt.ScratchVar):
+        super().__init__()
+        self._scratch = scratch
+
+    def __teal__(self, options: "CompileOptions"):
+        _notify(self, options)
+        return self._scratch.load().__teal__(options)
+
+    def __str__(self):
+        return f"({self.__class__.__name__} {self._scratch.slot})"
+
+    def type_of(self):
+        return self._scratch.type
+
+    def has_return(self) -> bool:
+        return False
+
+
+class _GroupLoad(pt.ImportScratchValue):
+    """Load a value cached by another transaction in the same atomic group, typed as the reader value."""
+
+    def __init__(self, txn: int | pt.Expr, slot: int, value_type: pt.TealType):
+        super().__init__(txn, slot)
+        self._value_type = value_type
+
+    def type_of(self):
+        return self._value_type
+
+
+class _Reader(ABC):
+    """
+    Shared `get` / `exists` interface of the external state readers.
+
+    Subclasses are frozen dataclasses declaring a `scratch` field (excluded from init), which holds
+    the ScratchVar the value is cached in once an existence check with store enabled is performed,
+    and a keyword-only `slot` field pinning the cache to a fixed scratch slot id. The `flag` field
+    (excluded from init) holds the FlagCache and bit position of the cached existence flag, and the
+    keyword-only `policy` field defers the choice of caching on existence checks to a CachePolicy.
+    The `asserted` field (excluded from init) is cleared once the value is cached by `cache()`
+    without asserting that it exists.
+    """
+
+    __slots__ = ()
+
+    scratch: pt.ScratchVar | None
+    slot: int | None
+    flag: tuple[FlagCache, int] | None
+    asserted: bool
+    policy: "CachePolicy | None"
+
+    def __post_init__(self):
+        if self.slot is not None and not 0 <= self.slot < NUM_SLOTS:
+            raise ValueError(f"Slot {self.slot} out of range, must be in [0, {NUM_SLOTS})")
+
+    @abstractmethod
+    def _getter(
+        self, assert_exists: bool = True, get_exists: bool = False, slot: pt.ScratchSlot | None = None
+    ) -> _Getter:
+        pass
+
+    @abstractmethod
+    def _value_type(self) -> pt.TealType:
+        pass
+
+    def _reserve_scratch(self) -> pt.ScratchVar:
+        if not (scratch := self.scratch):
+            # reserve new Scratch slot and store value instead of pop
+            scratch = pt.ScratchVar(self._value_type(), self.slot)  # type: ignore[arg-type]
+            object.__setattr__(self, "scratch", scratch)
+        return scratch
+
+    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
+        """
+        Get the value while optionally asserting that the value exists.
+
+        If the value does not exist and is not asserted, an integer value of 0 is returned.
+
+        If the existence check has already been performed with store enabled, the assert will be
+        skipped and the cached value will be returned directly unless load is explicitly disabled.
+        Under a CachePolicy, the value is read again instead if the policy decides not to cache it.
+
+        Raises a ValueError if the value is to be asserted but was cached by `cache()` without
+        asserting that it exists, as the existence flag is no longer available.
+        """
+        if load and self.scratch:
+            if assert_exists and not self.asserted:
+                raise ValueError(
+                    "Cannot assert existence of a value cached without assert, use get(assert_exists=False)"
+                )
+            return self.policy._get(self, assert_exists) if self.policy else _CachedLoad(self.scratch)
+        return self._getter(assert_exists)
+
+    def cache(self, assert_exists: bool = True) -> pt.Expr:
+        """
+        Read the value and cache it in an available scratch slot while optionally asserting that
+        the value exists, so that subsequent `get()` calls load the cached value.
+
+        Useful for hoisting reads with invariant arguments out of loops. If the value does not
+        exist and is not asserted, an integer value of 0 is cached, and subsequent `get()` calls
+        must pass `assert_exists=False`.
+        """
+        scratch = self._reserve_scratch()
+        if not assert_exists:
+            object.__setattr__(self, "asserted", False)
+        return self._getter(assert_exists, slot=scratch.slot)
+
+    def gload(self, txn: int | pt.Expr) -> pt.Expr:
+        """
+        Get the value cached by another transaction in the same atomic group, instead of reading it
+        again. Compiles to `gload` (or `gloads` if the transaction index is not a constant).
+
+        The reader must be pinned to a scratch slot, and the transaction at the given index must
+        cache the value through an identically pinned reader, e.g. by calling `cache()`, which can
+        be checked with `verify_group()`.
+        """
+        if self.slot is None:
+            raise ValueError("Cannot load value from another transaction unless pinned to a slot")
+        return _GroupLoad(txn, self.slot, self._value_type())
+
+    def get_or(self, default: pt.Expr) -> pt.Expr:
+        """
+        Get the value if it exists, or the default value otherwise.
+
+        Equivalent to `pt.If(reader.exists(), reader.get(), default)`, but without the jumps
+        required to join the branches. The value is always read, neither using nor populating the
+        cache.
+        """
+        return _GetOr(self._getter(assert_exists=False), default)
+
+    def exists(self, store: bool = True, flags: FlagCache | None = None, load: bool = True) -> pt.Expr:
+        """
+        Get the existence flag of the value. Returns an integer of 1 if the value exists and 0
+        otherwise.
+
+        If store is enabled, the value will be cached in an available scratch slot, unless the
+        reader has a CachePolicy deciding otherwise.
+
+        If a FlagCache is passed, the existence flag will be cached in a bit of its slot as well.
+        Once cached, the flag is loaded directly instead of reading the value again, unless load is
+        explicitly disabled. The flag is loaded on every path, even those not performing the check
+        caching it (where it reads as 0), see FlagCache.
+        """
+        if load and self.flag:
+            return self.flag[0].load(self.flag[1])
+        if store and self.policy:
+            exists = self.policy._exists(self)
+        elif store:
+            scratch = self._reserve_scratch()
+            exists = self._getter(assert_exists=False, get_exists=True, slot=scratch.slot)
+        else:
+            exists = self._getter(assert_exists=False, get_exists=True)
+        if flags:
+            if not self.flag or self.flag[0] is not flags:
+                object.__setattr__(self, "flag", (flags, flags.allocate()))
+            return _StoreFlag(exists, *typing.cast(tuple[FlagCache, int], self.flag))
+        return exists
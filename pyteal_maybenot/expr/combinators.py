@@ -0,0 +1,120 @@
+import typing
+
+import pyteal as pt
+
+from .base import _Reader
+from .policy import CacheDecision, CachePolicy
+
+if typing.TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+
+class _ExistsChain(pt.Expr):
+    """
+    Short-circuiting existence check over several readers.
+
+    Unlike `pt.And` / `pt.Or`, which evaluate every operand, the chain branches out as soon as the
+    result is decided. The flag of the deciding read is left on the stack as the result.
+
+    When storing, the slots of readers skipped by the early exit are filled with an integer value of
+    0 on the exit path, so that later `get()` calls (which load from cache) compile on every path.
+    Slots which were already reserved before the chain was constructed are left untouched, as are
+    slots of values a CachePolicy decides not to cache. As the fills are only valid on the false
+    path, where the result does not depend on the skipped readers, chains exiting on an existing
+    value only cache the first reader, which is read on every path.
+    """
+
+    def __init__(self, readers: typing.Sequence[_Reader], exit_on: bool, store: bool = True):
+        super().__init__()
+
+        if not readers:
+            raise ValueError("At least one reader is required")
+
+        fills: list[pt.ScratchSlot | None] = []
+        decisions: list[tuple[CachePolicy, CacheDecision] | None] = []
+        exprs: list[pt.Expr] = []
+        for i, reader in enumerate(readers):
+            # skipped values may exist when exiting on an existing value, they must be read again
+            cached = store and (i == 0 or not exit_on)
+            # only fill slots reserved by this chain, previously cached values must not be overwritten
+            reserved = cached and reader.scratch is None
+            exprs.append(reader.exists(cached))
+            fills.append(reader.scratch.slot if reserved and reader.scratch else None)
+            decision = reader.policy._decision(reader) if cached and reader.policy else None
+            decisions.append((typing.cast(CachePolicy, reader.policy), decision) if decision else None)
+
+        self._exprs = exprs
+        self._fills = fills
+        self._decisions = decisions
+        self._exit_on = exit_on
+
+    def __teal__(self, options: "CompileOptions"):
+        end = pt.TealSimpleBlock([])
+
+        # chain of fill blocks - exiting after read i jumps into the chain at position i + 1
+        exits: list[pt.TealSimpleBlock] = [end] * len(self._exprs)
+        next_block = end
+        for i in reversed(range(1, len(self._exprs))):
+            slot = self._fills[i]
+            if decided := self._decisions[i]:
+                # values not cached by their policy are read again, no need to fill
+                decided[0]._decide(options)
+                if not decided[1].cached:
+                    slot = None
+            if slot:
+                fill = pt.TealSimpleBlock([pt.TealOp(self, pt.Op.int, 0), pt.TealOp(self, pt.Op.store, slot)])
+                fill.setNextBlock(next_block)
+                next_block = fill
+            exits[i - 1] = next_block
+
+        start, prev_end = self._exprs[0].__teal__(options)
+        for i, expr in enumerate(self._exprs[1:]):
+            # keep a copy of the flag as the result in case of exiting
+            dup = pt.TealSimpleBlock([pt.TealOp(self, pt.Op.dup)])
+            branch = pt.TealConditionalBlock([])
+            pop = pt.TealSimpleBlock([pt.TealOp(self, pt.Op.pop)])
+            if self._exit_on:
+                branch.setTrueBlock(exits[i])
+                branch.setFalseBlock(pop)
+            else:
+                branch.setTrueBlock(pop)
+                branch.setFalseBlock(exits[i])
+            prev_end.setNextBlock(dup)
+            dup.setNextBlock(branch)
+
+            expr_start, prev_end = expr.__teal__(options)
+            pop.setNextBlock(expr_start)
+        prev_end.setNextBlock(end)
+        return start, end
+
+    def __str__(self):
+        return f"({'any_exist' if self._exit_on else 'all_exist'} {' '.join(str(e) for e in self._exprs)})"
+
+    def type_of(self):
+        return pt.TealType.uint64
+
+    def has_return(self) -> bool:
+        return False
+
+
+def all_exist(*readers: _Reader, store: bool = True) -> pt.Expr:
+    """
+    Get whether the values of all readers exist. Returns an integer of 1 if all values exist and 0
+    otherwise.
+
+    Reading stops at the first value which does not exist. If store is enabled, the values read are
+    cached as in `exists()`, while values skipped are cached as an integer value of 0.
+    """
+    return _ExistsChain(readers, exit_on=False, store=store)
+
+
+def any_exist(*readers: _Reader, store: bool = True) -> pt.Expr:
+    """
+    Get whether the value of any reader exists. Returns an integer of 1 if a value exists and 0
+    otherwise.
+
+    Reading stops at the first value which exists. If store is enabled, the value of the first
+    reader is cached as in `exists()`. The values of the other readers are not cached, as they may
+    have been skipped even though they exist, so later `get()` calls read them again.
+    """
+    return _ExistsChain(readers, exit_on=True, store=store)
@@ -1,76 +1,18 @@
+import ast
+import base64
 import typing
 from abc import ABC
 from dataclasses import dataclass, field
 
 import pyteal as pt
 
-if typing.TYPE_CHECKING:
-    from pyteal.compiler import CompileOptions
+from .base import _Getter, _Reader
+from .flags import FlagCache
+from .policy import CachePolicy
 
 
-class _AppGetter(pt.Expr, ABC):
-    """
-    Get state of an external application.
-
-    Used over PyTeal MaybeValue implementation because this wastes a lot of operations on storing
-    and loading into ScratchVars, even when branching is not required. This implementation just
-    asserts or pops the first value directly (denoting existence of the field) and then leaves the
-    resulting value on the stack, or alternatively retrives the existence flag alone (while
-    optionally storing the value).
-    """
-
-    op: pt.Op
-
-    def __init__(
-        self,
-        assert_exists: bool = True,
-        get_exists: bool = False,
-        slot: pt.ScratchSlot | None = None,
-        *args: pt.Expr,
-    ):
-        super().__init__()
-
-        if assert_exists and get_exists:
-            raise ValueError("Cannot assert and return exists flag simultaneously")
-        elif (not get_exists) and slot:
-            raise ValueError("Cannot store value in ScratchSlot unless getting exists flag")
-
-        self._slot = slot
-        self._args = args
-        self._assert_exists = assert_exists
-        self._get_exists = get_exists
-
-    def __teal__(self, options: "CompileOptions"):
-        # push [value, value_exists] on the stack
-        get_app_state = pt.TealOp(self, self.op)
-        get_start, get_end = pt.TealSimpleBlock.FromOp(options, get_app_state, *self._args)
-        # need to swap if returning exists flag
-        if self._get_exists:
-            swap = pt.TealSimpleBlock(
-                [
-                    pt.TealOp(self, pt.Op.swap),
-                    # if opting not to store, the value simply gets popped
-                    pt.TealOp(self, pt.Op.store, self._slot) if self._slot else pt.TealOp(self, pt.Op.pop),
-                ]
-            )
-            get_end.setNextBlock(swap)
-            return get_start, swap
-        # we assert that the value_exists (1 if exists, 0 if not), or simply pop it if assert_exists is false
-        value_exists_op = pt.Op.assert_ if self._assert_exists else pt.Op.pop
-        value_start, value_end = pt.TealSimpleBlock.FromOp(options, pt.TealOp(self, value_exists_op))
-        get_end.setNextBlock(value_start)
-        return get_start, value_end
-
-    def __str__(self):
-        return f"({self.__class__.__name__} (assert={self._assert_exists},get_exists={self._get_exists},slot={None if not self._slot else self._slot.id}))"
-
-    def type_of(self):
-        if self._get_exists:
-            return pt.TealType.uint64
-        return pt.TealType.anytype
-
-    def has_return(self) -> bool:
-        return False
+class _AppGetter(_Getter, ABC):
+    """Get state of an external application."""
 
 
 class _GetExAppLocal(_AppGetter):
@@ -106,76 +48,129 @@ class _GetExAppGlobal(_AppGetter):
         super().__init__(assert_exists, get_exists, slot, app, key)
 
 
+def _literal_bytes(expr: str | bytes | pt.Expr) -> bytes | None:
+    """Get the value of a byte string known at compile time."""
+    if isinstance(expr, str):
+        return expr.encode()
+    if isinstance(expr, bytes):
+        return expr
+    if isinstance(expr, pt.Bytes):
+        # attributes are untyped in PyTeal
+        base: str = getattr(expr, "base")
+        byte_str: str = getattr(expr, "byte_str")
+        match base:
+            case "utf8":
+                # escaped string literal, see pyteal.util.escapeStr
+                return ast.literal_eval(f"b{byte_str}")
+            case "base16":
+                return bytes.fromhex(byte_str)
+            case "base32":
+                return base64.b32decode(byte_str + "=" * (-len(byte_str) % 8))
+            case "base64":
+                return base64.b64decode(byte_str)
+    return None
+
+
+def _check_index(name: str, index: int | pt.Expr):
+    if isinstance(index, int) and not 0 <= index < 2**64:
+        raise ValueError(f"{name.capitalize()} {index} out of uint64 range")
+
+
+def _indexed_key(prefix: str | bytes | pt.Expr, index: int | pt.Expr) -> pt.Expr:
+    """Key of an array element stored as `prefix || itob(index)`."""
+    _check_index("index", index)
+    prefix_value = _literal_bytes(prefix)
+    index_value = index.value if isinstance(index, pt.Int) else index
+    if prefix_value is not None and isinstance(index_value, int):
+        # fold constant keys into a single byte string
+        return pt.Bytes(prefix_value + index_value.to_bytes(8, "big"))
+    prefix_expr = prefix if isinstance(prefix, pt.Expr) else pt.Bytes(prefix)
+    index_expr = pt.Int(index_value) if isinstance(index_value, int) else index_value
+    return pt.Concat(prefix_expr, pt.Itob(index_expr))
+
+
 @dataclass(frozen=True, slots=True)
-class ExAppLocal:
+class ExAppLocal(_Reader):
+    """Local state of an external application."""
+
     account: pt.Expr
     app: pt.Expr
     key: pt.Expr
     type: pt.TealType = pt.TealType.anytype
     scratch: pt.ScratchVar | None = field(default=None, init=False, compare=False)
+    flag: tuple[FlagCache, int] | None = field(default=None, init=False, compare=False)
+    asserted: bool = field(default=True, init=False, compare=False)
+    slot: int | None = field(default=None, kw_only=True)
+    policy: CachePolicy | None = field(default=None, kw_only=True, compare=False)
 
-    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
-        """
-        Get the local state value while optionally asserting that the value exists.
-
-        If the value does not exist and is not asserted, an integer value of 0 is returned.
-
-        If the existence check has already been performed with store enabled, the assert will be
-        skipped and the value will be returned directly unless load is explicitly disabled.
-        """
-        if load and self.scratch:
-            return self.scratch.load()
-        return _GetExAppLocal(self.account, self.app, self.key, assert_exists)
-
-    def exists(self, store: bool = True) -> pt.Expr:
-        """
-        Get the existence flag of the local state value. Returns an integer of 1 if the value exists
-        and 0 otherwise.
+    def _getter(self, assert_exists=True, get_exists=False, slot=None):
+        return _GetExAppLocal(self.account, self.app, self.key, assert_exists, get_exists, slot)
 
-        If store is enabled, the value will be stored in an available scratch slot.
-        """
-        if store:
-            if not (scratch := self.scratch):
-                # reserve new Scratch slot and store value instead of pop
-                scratch = pt.ScratchVar(self.type)
-                object.__setattr__(self, "scratch", scratch)
-            return _GetExAppLocal(
-                self.account, self.app, self.key, assert_exists=False, get_exists=True, slot=scratch.slot
-            )
-        return _GetExAppLocal(self.account, self.app, self.key, assert_exists=False, get_exists=True)
+    def _value_type(self):
+        return self.type
 
 
 @dataclass(frozen=True, slots=True)
-class ExAppGlobal:
+class ExAppGlobal(_Reader):
+    """Global state of an external application."""
+
     app: pt.Expr
     key: pt.Expr
     type: pt.TealType = pt.TealType.anytype
     scratch: pt.ScratchVar | None = field(default=None, init=False, compare=False)
+    flag: tuple[FlagCache, int] | None = field(default=None, init=False, compare=False)
+    asserted: bool = field(default=True, init=False, compare=False)
+    slot: int | None = field(default=None, kw_only=True)
+    policy: CachePolicy | None = field(default=None, kw_only=True, compare=False)
 
-    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
-        """
-        Get the global state value while optionally asserting that the value exists.
+    def _getter(self, assert_exists=True, get_exists=False, slot=None):
+        return _GetExAppGlobal(self.app, self.key, assert_exists, get_exists, slot)
 
-        If the value does not exist and is not asserted, an integer value of 0 is returned.
+    def _value_type(self):
+        return self.type
 
-        If the existence check has already been performed with store enabled, the assert will be
-        skipped and the cached value will be returned directly unless load is explicitly disabled.
+    @classmethod
+    def indexed(
+        cls,
+        app: pt.Expr,
+        prefix: str | bytes | pt.Expr,
+        index: int | pt.Expr,
+        type: pt.TealType = pt.TealType.anytype,
+        *,
+        slot: int | None = None,
+        policy: CachePolicy | None = None,
+    ) -> "ExAppGlobal":
         """
-        if load and self.scratch:
-            return self.scratch.load()
-        return _GetExAppGlobal(self.app, self.key, assert_exists)
+        Global state of an external application storing an array as keys of `prefix || itob(index)`.
 
-    def exists(self, store: bool = True) -> pt.Expr:
+        If both the prefix and the index are constants, the key is folded into a single byte string
+        at compile time. Raises a ValueError if a constant index is out of the uint64 range.
         """
-        Get the existence flag of the global state value. Returns an integer of 1 if the value
-        exists and 0 otherwise.
+        return cls(app, _indexed_key(prefix, index), type, slot=slot, policy=policy)
 
-        If store is enabled, the value will be cached in an available scratch slot.
+    @classmethod
+    def indexed_range(
+        cls,
+        app: pt.Expr,
+        prefix: str | bytes | pt.Expr,
+        start: int | pt.Expr,
+        stop: int | pt.Expr,
+        body: typing.Callable[["ExAppGlobal"], pt.Expr],
+        type: pt.TealType = pt.TealType.anytype,
+        *,
+        slot: int | None = None,
+        policy: CachePolicy | None = None,
+    ) -> pt.Expr:
+        """
+        Loop over the array elements stored as keys of `prefix || itob(index)` for indices in
+        [start, stop), evaluating the expression returned by body for the element reader.
         """
-        if store:
-            if not (scratch := self.scratch):
-                # reserve new Scratch slot and store value instead of pop
-                scratch = pt.ScratchVar(self.type)
-                object.__setattr__(self, "scratch", scratch)
-            return _GetExAppGlobal(self.app, self.key, assert_exists=False, get_exists=True, slot=scratch.slot)
-        return _GetExAppGlobal(self.app, self.key, assert_exists=False, get_exists=True)
+        _check_index("start", start)
+        _check_index("stop", stop)
+        index = pt.ScratchVar(pt.TealType.uint64)
+        start_expr = pt.Int(start) if isinstance(start, int) else start
+        stop_expr = pt.Int(stop) if isinstance(stop, int) else stop
+        element = cls.indexed(app, prefix, index.load(), type, slot=slot, policy=policy)
+        return pt.For(index.store(start_expr), index.load() < stop_expr, index.store(index.load() + pt.Int(1))).Do(
+            body(element)
+        )
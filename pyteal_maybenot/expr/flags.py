@@ -0,0 +1,76 @@
+import typing
+
+import pyteal as pt
+
+if typing.TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+FLAGS_PER_SLOT = 64
+
+
+class FlagCache:
+    """
+    Existence flags of up to 64 readers packed into the bits of a single uint64 scratch slot.
+
+    Bit positions are assigned to readers in order of their first existence check using the cache.
+    The slot must be cleared (see `clear`) before the first existence check is performed.
+
+    Once a reader has an existence check using the cache, its later `exists()` calls load the bit
+    on every path, whether or not the check was performed on that path. As the whole slot is
+    stored by `clear()`, the compiler cannot detect this, and a bit which was not set reads as 0
+    even if the value exists. The checks caching flags must therefore be performed on every path
+    leading to the loads, otherwise pass `load=False` to `exists()`.
+    """
+
+    def __init__(self, slot: int | None = None):
+        self.scratch = pt.ScratchVar(pt.TealType.uint64, slot)  # type: ignore[arg-type]
+        self._size = 0
+
+    def allocate(self) -> int:
+        """Reserve the next available bit position."""
+        if self._size == FLAGS_PER_SLOT:
+            raise ValueError(f"Cannot cache more than {FLAGS_PER_SLOT} flags in a single slot")
+        self._size += 1
+        return self._size - 1
+
+    def clear(self) -> pt.Expr:
+        """Reset all flags of the cache."""
+        return self.scratch.store(pt.Int(0))
+
+    def load(self, bit: int) -> pt.Expr:
+        """Get the flag cached in the given bit position."""
+        return pt.GetBit(self.scratch.load(), pt.Int(bit))
+
+
+class _StoreFlag(pt.Expr):
+    """Cache the existence flag left on the stack by a reader, leaving the flag on the stack."""
+
+    def __init__(self, exists: pt.Expr, flags: FlagCache, bit: int):
+        super().__init__()
+        self._exists = exists
+        self._flags = flags
+        self._bit = bit
+
+    def __teal__(self, options: "CompileOptions"):
+        start, end = self._exists.__teal__(options)
+        # [..., flag] -> [..., flag, flags, bit, flag] -> [..., flag]
+        store = pt.TealSimpleBlock(
+            [
+                pt.TealOp(self, pt.Op.load, self._flags.scratch.slot),
+                pt.TealOp(self, pt.Op.int, self._bit),
+                pt.TealOp(self, pt.Op.dig, 2),
+                pt.TealOp(self, pt.Op.setbit),
+                pt.TealOp(self, pt.Op.store, self._flags.scratch.slot),
+            ]
+        )
+        end.setNextBlock(store)
+        return start, store
+
+    def __str__(self):
+        return f"({self.__class__.__name__} {self._exists} {self._flags.scratch.slot} {self._bit})"
+
+    def type_of(self):
+        return pt.TealType.uint64
+
+    def has_return(self) -> bool:
+        return False
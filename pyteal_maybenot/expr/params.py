@@ -5,8 +5,9 @@ from dataclasses import field as field_
 
 import pyteal as pt
 
-if typing.TYPE_CHECKING:
-    from pyteal.compiler import CompileOptions
+from .base import _Getter, _Reader
+from .flags import FlagCache
+from .policy import CachePolicy
 
 
 @dataclass(frozen=True, slots=True)
@@ -90,18 +91,9 @@ _ACCT_PARAMS_MAP: dict[AcctParamsField, Field] = {
 }
 
 
-class _FieldGetter(pt.Expr, ABC):
-    """
-    Get external parameter (asset_holding, asset_params, app_params, acct_params).
+class _FieldGetter(_Getter, ABC):
+    """Get external parameter (asset_holding, asset_params, app_params, acct_params)."""
 
-    Used over PyTeal MaybeValue implementation because this wastes a lot of operations on storing
-    and loading into ScratchVars, even when branching is not required. This implementation just
-    asserts or pops the first value directly (denoting existence of the field) and then leaves the
-    resulting value on the stack, or alternatively retrives the existence flag alone (while
-    optionally storing the value).
-    """
-
-    op: pt.Op
     fields: dict[str, Field]
 
     def __init__(
@@ -112,53 +104,20 @@ class _FieldGetter(pt.Expr, ABC):
         slot: pt.ScratchSlot | None = None,
         *args: pt.Expr,
     ):
-        super().__init__()
-
         if field not in self.fields:
             raise ValueError(f"{field} not a valid field in {self.__class__.__name__}")
 
-        if assert_exists and get_exists:
-            raise ValueError("Cannot assert and return exists flag simultaneously")
-        elif (not get_exists) and slot:
-            raise ValueError("Cannot store value in ScratchSlot unless getting exists flag")
-
-        self._slot = slot
-        self._args = args
+        super().__init__(assert_exists, get_exists, slot, *args)
         self._field = field
-        self._assert_exists = assert_exists
-        self._get_exists = get_exists
-
-    def __teal__(self, options: "CompileOptions"):
-        # push [value, value_exists] on the stack
-        get_field = pt.TealOp(self, self.op, self.fields[self._field].name)
-        get_start, get_end = pt.TealSimpleBlock.FromOp(options, get_field, *self._args)
-        # need to swap if returning exists flag
-        if self._get_exists:
-            swap = pt.TealSimpleBlock(
-                [
-                    pt.TealOp(self, pt.Op.swap),
-                    # if opting not to store, the value simply gets popped
-                    pt.TealOp(self, pt.Op.store, self._slot) if self._slot else pt.TealOp(self, pt.Op.pop),
-                ]
-            )
-            get_end.setNextBlock(swap)
-            return get_start, swap
-        # if assert has value, we assert the value_exists (1 if exists, 0 if not), else just pop it
-        value_exists_op = pt.Op.assert_ if self._assert_exists else pt.Op.pop
-        value_start, value_end = pt.TealSimpleBlock.FromOp(options, pt.TealOp(self, value_exists_op))
-        get_end.setNextBlock(value_start)
-        return get_start, value_end
-
-    def __str__(self):
-        return f"({self.__class__.__name__} ({self._field},assert={self._assert_exists},get_exists={self._get_exists},slot={None if not self._slot else self._slot.id}))"
-
-    def type_of(self):
-        if self._get_exists:
-            return pt.TealType.uint64
+
+    def _immediates(self):
+        return [self.fields[self._field].name]
+
+    def _value_type(self):
         return self.fields[self._field].teal_type
 
-    def has_return(self) -> bool:
-        return False
+    def _describe(self):
+        return f"{self._field},"
 
 
 class _GetAssetHolding(_FieldGetter):
@@ -231,143 +190,77 @@ class _GetAcctParams(_FieldGetter):
 
 
 @dataclass(frozen=True, slots=True)
-class AssetHolding:
+class AssetHolding(_Reader):
+    """Asset holding of an account."""
+
     account: pt.Expr
     asset: pt.Expr
     field: AssetHoldingField
     scratch: pt.ScratchVar | None = field_(default=None, init=False, compare=False)
+    flag: tuple[FlagCache, int] | None = field_(default=None, init=False, compare=False)
+    asserted: bool = field_(default=True, init=False, compare=False)
+    slot: int | None = field_(default=None, kw_only=True)
+    policy: CachePolicy | None = field_(default=None, kw_only=True, compare=False)
+
+    def _getter(self, assert_exists=True, get_exists=False, slot=None):
+        return _GetAssetHolding(self.account, self.asset, self.field, assert_exists, get_exists, slot)
 
-    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
-        """
-        Get the asset holding value while optionally asserting that the value exists.
-
-        If the value does not exist and is not asserted, an integer value of 0 is returned.
-
-        If the existence check has already been performed with store enabled, the assert will be
-        skipped and the value will be returned directly unless load is explicitly disabled.
-        """
-        if load and self.scratch:
-            return self.scratch.load()
-        return _GetAssetHolding(self.account, self.asset, self.field, assert_exists)
-
-    def exists(self, store: bool = True) -> pt.Expr:
-        """
-        Get the existence flag of the asset holding value. Returns an integer of 1 if the value
-        exists and 0 otherwise.
-
-        If store is enabled, the value will be stored in an available scratch slot.
-        """
-        if store:
-            if not (scratch := self.scratch):
-                # reserve new Scratch slot and store value instead of pop
-                scratch = pt.ScratchVar(_ASSET_HOLDING_MAP[self.field].teal_type)
-                object.__setattr__(self, "scratch", scratch)
-            return _GetAssetHolding(
-                self.account, self.asset, self.field, assert_exists=False, get_exists=True, slot=scratch.slot
-            )
-        return _GetAssetHolding(self.account, self.asset, self.field, assert_exists=False, get_exists=True)
+    def _value_type(self):
+        return _ASSET_HOLDING_MAP[self.field].teal_type
 
 
 @dataclass(frozen=True, slots=True)
-class AssetParams:
+class AssetParams(_Reader):
+    """Asset parameters."""
+
     asset: pt.Expr
     field: AssetParamsField
     scratch: pt.ScratchVar | None = field_(default=None, init=False, compare=False)
+    flag: tuple[FlagCache, int] | None = field_(default=None, init=False, compare=False)
+    asserted: bool = field_(default=True, init=False, compare=False)
+    slot: int | None = field_(default=None, kw_only=True)
+    policy: CachePolicy | None = field_(default=None, kw_only=True, compare=False)
 
-    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
-        """
-        Get the asset params value while optionally asserting that the value exists.
-
-        If the value does not exist and is not asserted, an integer value of 0 is returned.
+    def _getter(self, assert_exists=True, get_exists=False, slot=None):
+        return _GetAssetParams(self.asset, self.field, assert_exists, get_exists, slot)
 
-        If the existence check has already been performed with store enabled, the assert will be
-        skipped and the value will be returned directly unless load is explicitly disabled.
-        """
-        if load and self.scratch:
-            return self.scratch.load()
-        return _GetAssetParams(self.asset, self.field, assert_exists)
-
-    def exists(self, store: bool = True) -> pt.Expr:
-        """
-        Get the existence flag of the asset params value. Returns an integer of 1 if the value
-        exists and 0 otherwise.
-
-        If store is enabled, the value will be stored in an available scratch slot.
-        """
-        if store:
-            if not (scratch := self.scratch):
-                # reserve new Scratch slot and store value instead of pop
-                scratch = pt.ScratchVar(_ASSET_PARAMS_MAP[self.field].teal_type)
-                object.__setattr__(self, "scratch", scratch)
-            return _GetAssetParams(self.asset, self.field, assert_exists=False, get_exists=True, slot=scratch.slot)
-        return _GetAssetParams(self.asset, self.field, assert_exists=False, get_exists=True)
+    def _value_type(self):
+        return _ASSET_PARAMS_MAP[self.field].teal_type
 
 
 @dataclass(frozen=True, slots=True)
-class AppParams:
+class AppParams(_Reader):
+    """Application parameters."""
+
     app: pt.Expr
     field: AppParamsField
     scratch: pt.ScratchVar | None = field_(default=None, init=False, compare=False)
+    flag: tuple[FlagCache, int] | None = field_(default=None, init=False, compare=False)
+    asserted: bool = field_(default=True, init=False, compare=False)
+    slot: int | None = field_(default=None, kw_only=True)
+    policy: CachePolicy | None = field_(default=None, kw_only=True, compare=False)
 
-    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
-        """
-        Get the app params value while optionally asserting that the value exists.
-
-        If the value does not exist and is not asserted, an integer value of 0 is returned.
+    def _getter(self, assert_exists=True, get_exists=False, slot=None):
+        return _GetAppParams(self.app, self.field, assert_exists, get_exists, slot)
 
-        If the existence check has already been performed with store enabled, the assert will be
-        skipped and the value will be returned directly unless load is explicitly disabled.
-        """
-        if load and self.scratch:
-            return self.scratch.load()
-        return _GetAppParams(self.app, self.field, assert_exists)
-
-    def exists(self, store: bool = True) -> pt.Expr:
-        """
-        Get the existence flag of the app params value. Returns an integer of 1 if the value exists
-        and 0 otherwise.
-
-        If store is enabled, the value will be stored in an available scratch slot.
-        """
-        if store:
-            if not (scratch := self.scratch):
-                # reserve new Scratch slot and store value instead of pop
-                scratch = pt.ScratchVar(_APP_PARAMS_MAP[self.field].teal_type)
-                object.__setattr__(self, "scratch", scratch)
-            return _GetAppParams(self.app, self.field, assert_exists=False, get_exists=True, slot=scratch.slot)
-        return _GetAppParams(self.app, self.field, assert_exists=False, get_exists=True)
+    def _value_type(self):
+        return _APP_PARAMS_MAP[self.field].teal_type
 
 
 @dataclass(frozen=True, slots=True)
-class AcctParams:
+class AcctParams(_Reader):
+    """Account parameters."""
+
     account: pt.Expr
     field: AcctParamsField
     scratch: pt.ScratchVar | None = field_(default=None, init=False, compare=False)
+    flag: tuple[FlagCache, int] | None = field_(default=None, init=False, compare=False)
+    asserted: bool = field_(default=True, init=False, compare=False)
+    slot: int | None = field_(default=None, kw_only=True)
+    policy: CachePolicy | None = field_(default=None, kw_only=True, compare=False)
+
+    def _getter(self, assert_exists=True, get_exists=False, slot=None):
+        return _GetAcctParams(self.account, self.field, assert_exists, get_exists, slot)
 
-    def get(self, assert_exists: bool = True, load: bool = True) -> pt.Expr:
-        """
-        Get the account params value while optionally asserting that the value exists.
-
-        If the value does not exist and is not asserted, an integer value of 0 is returned.
-
-        If the existence check has already been performed with store enabled, the assert will be
-        skipped and the value will be returned directly unless load is explicitly disabled.
-        """
-        if load and self.scratch:
-            return self.scratch.load()
-        return _GetAcctParams(self.account, self.field, assert_exists)
-
-    def exists(self, store: bool = True) -> pt.Expr:
-        """
-        Get the existence flag of the account params value. Returns an integer of 1 if the value
-        exists and 0 otherwise.
-
-        If store is enabled, the value will be stored in an available scratch slot.
-        """
-        if store:
-            if not (scratch := self.scratch):
-                # reserve new Scratch slot and store value instead of pop
-                scratch = pt.ScratchVar(_ACCT_PARAMS_MAP[self.field].teal_type)
-                object.__setattr__(self, "scratch", scratch)
-            return _GetAcctParams(self.account, self.field, assert_exists=False, get_exists=True, slot=scratch.slot)
-        return _GetAcctParams(self.account, self.field, assert_exists=False, get_exists=True)
+    def _value_type(self):
+        return _ACCT_PARAMS_MAP[self.field].teal_type
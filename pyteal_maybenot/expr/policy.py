@@ -0,0 +1,144 @@
+import json
+import typing
+from dataclasses import dataclass, field
+
+import pyteal as pt
+from pyteal.config import NUM_SLOTS
+
+from .base import _CachedLoad, _Getter, _observers, _Reader
+
+if typing.TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+
+@dataclass(slots=True)
+class CacheDecision:
+    """Whether the value of a reader checked by `exists()` under a CachePolicy is cached."""
+
+    # op, immediates and arguments of the reader
+    reader: str
+    # get() calls following the existence check
+    reads: int = 0
+    # estimated ops of the argument expressions, set once decided
+    cost: int | None = None
+    # None until decided, when the first expression of the policy is compiled
+    cached: bool | None = None
+    _getter: _Getter | None = field(default=None, repr=False)
+
+    @property
+    def savings(self) -> int:
+        """Ops saved by caching: every get() loads (1 op) rather than reading again (args + 2 ops)."""
+        return self.reads * ((self.cost or 0) + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "reader": self.reader,
+            "reads": self.reads,
+            "cost": self.cost,
+            "savings": self.savings,
+            "cached": self.cached,
+        }
+
+
+class CachePolicy:
+    """
+    Automatic choice between caching values on existence checks and reading them again, for readers
+    constructed with `policy=`.
+
+    Existence checks with store enabled only reserve a slot, the choice is made when the program is
+    compiled, once every `get()` call following the checks is known. Storing instead of popping
+    the value costs nothing, so caching saves ops whenever the value is read again. If more values
+    would be cached than the slot budget allows, the values with the largest savings (estimated
+    from the number of reads and the ops of the reader arguments) are cached.
+
+    A policy is meant for a single program, the budget is shared by every program using it.
+    """
+
+    def __init__(self, budget: int = NUM_SLOTS):
+        if not 0 <= budget <= NUM_SLOTS:
+            raise ValueError(f"Budget {budget} out of range, must be in [0, {NUM_SLOTS}]")
+
+        self.budget = budget
+        self.decisions: list[CacheDecision] = []
+        # decisions by id of the reader, keeping a reference to the reader so the id is not reused
+        self._readers: dict[int, tuple[_Reader, CacheDecision]] = {}
+        self._deciding = False
+
+    def _decision(self, reader: _Reader) -> CacheDecision | None:
+        entry = self._readers.get(id(reader))
+        return entry[1] if entry else None
+
+    def _exists(self, reader: _Reader) -> pt.Expr:
+        scratch = reader._reserve_scratch()
+        if (decision := self._decision(reader)) is None:
+            getter = reader._getter(assert_exists=False, get_exists=True)
+            description = " ".join([str(getter.op), *getter._immediates(), *map(str, getter._args)])
+            decision = CacheDecision(description, _getter=getter)
+            self._readers[id(reader)] = (reader, decision)
+            self.decisions.append(decision)
+        return _Decided(
+            self,
+            decision,
+            reader._getter(assert_exists=False, get_exists=True, slot=scratch.slot),
+            reader._getter(assert_exists=False, get_exists=True),
+        )
+
+    def _get(self, reader: _Reader, assert_exists: bool) -> pt.Expr:
+        scratch = typing.cast(pt.ScratchVar, reader.scratch)
+        if (decision := self._decision(reader)) is None:
+            # cached explicitly through cache()
+            return _CachedLoad(scratch)
+        decision.reads += 1
+        return _Decided(self, decision, _CachedLoad(scratch), reader._getter(assert_exists))
+
+    def _decide(self, options: "CompileOptions"):
+        if self._deciding or not (undecided := [d for d in self.decisions if d.cached is None]):
+            return
+
+        # estimate by lowering the arguments, without notifying observers of nested readers
+        self._deciding = True
+        token = _observers.set(())
+        try:
+            for decision in undecided:
+                decision.cost = sum(
+                    len(block.ops)
+                    for arg in typing.cast(_Getter, decision._getter)._args
+                    for block in pt.TealBlock.Iterate(arg.__teal__(options)[0])
+                )
+        finally:
+            _observers.reset(token)
+            self._deciding = False
+
+        available = self.budget - sum(1 for d in self.decisions if d.cached)
+        for decision in sorted(undecided, key=lambda d: d.savings, reverse=True):
+            decision.cached = decision.savings > 0 and available > 0
+            available -= decision.cached
+
+    def to_json(self, **kwargs) -> str:
+        """Export the decisions as a JSON list, in order of the existence checks."""
+        return json.dumps([decision.to_dict() for decision in self.decisions], **kwargs)
+
+
+class _Decided(pt.Expr):
+    """Expression lowered depending on the decision of a CachePolicy."""
+
+    def __init__(self, policy: CachePolicy, decision: CacheDecision, cached: pt.Expr, uncached: pt.Expr):
+        super().__init__()
+        self._policy = policy
+        self._decision = decision
+        self._cached = cached
+        self._uncached = uncached
+
+    def __teal__(self, options: "CompileOptions"):
+        self._policy._decide(options)
+        # nested in arguments being estimated while deciding, assume uncached
+        return (self._cached if self._decision.cached else self._uncached).__teal__(options)
+
+    def __str__(self):
+        return f"({self.__class__.__name__} {self._cached} {self._uncached})"
+
+    def type_of(self):
+        return self._uncached.type_of()
+
+    def has_return(self) -> bool:
+        return False
@@ -0,0 +1,181 @@
+import json
+import typing
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import pyteal as pt
+from algosdk import encoding
+
+from .expr.base import _Getter, _Programs, observe, unobserve
+from .expr.ex import _literal_bytes
+
+if typing.TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+MAIN = "main"
+
+# role of each argument of the reader ops
+_ROLES: dict[pt.Op, tuple[str, ...]] = {
+    pt.Op.app_global_get_ex: ("app", "key"),
+    pt.Op.app_local_get_ex: ("account", "app", "key"),
+    pt.Op.asset_holding_get: ("account", "asset"),
+    pt.Op.asset_params_get: ("asset",),
+    pt.Op.app_params_get: ("app",),
+    pt.Op.acct_params_get: ("account",),
+}
+
+# foreign array referenced by each role
+_FOREIGN: dict[str, pt.TxnField] = {
+    "account": pt.TxnField.accounts,
+    "app": pt.TxnField.applications,
+    "asset": pt.TxnField.assets,
+}
+
+# references available without being included in the foreign arrays
+_IMPLICIT: dict[str, tuple[pt.TxnField | pt.GlobalField, ...]] = {
+    "account": (pt.TxnField.sender, pt.GlobalField.current_app_address),
+    "app": (pt.GlobalField.current_app_id,),
+    "asset": (),
+}
+
+
+@dataclass(slots=True)
+class SubroutineFootprint:
+    """External resources read by a single subroutine (or the main program)."""
+
+    # indices into the foreign arrays of the transaction
+    accounts: set[int] = field(default_factory=set)
+    applications: set[int] = field(default_factory=set)
+    assets: set[int] = field(default_factory=set)
+    # literal addresses and ids which must be included in the foreign arrays
+    addresses: set[str] = field(default_factory=set)
+    app_ids: set[int] = field(default_factory=set)
+    asset_ids: set[int] = field(default_factory=set)
+    # literal state keys, hex encoded
+    keys: set[str] = field(default_factory=set)
+    # template placeholders referenced by reads
+    templates: set[str] = field(default_factory=set)
+    # references which cannot be resolved statically
+    dynamic: set[str] = field(default_factory=set)
+
+    def _add(self, role: str, expr: pt.Expr):
+        if role == "key":
+            if (key := _literal_bytes(expr)) is not None:
+                self.keys.add(key.hex())
+            elif isinstance(expr, pt.Tmpl):
+                self.templates.add(expr.name)
+            else:
+                self.dynamic.add(str(expr))
+            return
+
+        if isinstance(expr, (pt.TxnExpr, pt.Global)) and expr.field in _IMPLICIT[role]:
+            return
+        if isinstance(expr, pt.TxnaExpr) and expr.field is _FOREIGN[role]:
+            index = expr.index.value if isinstance(expr.index, pt.Int) else expr.index
+            if isinstance(index, int):
+                getattr(self, expr.field.arg_name.lower()).add(index)
+                return
+        elif isinstance(expr, pt.Int) and role != "account":
+            (self.app_ids if role == "app" else self.asset_ids).add(expr.value)
+            return
+        elif isinstance(expr, pt.Addr) and role == "account":
+            self.addresses.add(expr.address)
+            return
+        elif isinstance(expr, pt.Bytes) and role == "account" and len(address := _literal_bytes(expr) or b"") == 32:
+            self.addresses.add(encoding.encode_address(address))
+            return
+        elif isinstance(expr, pt.Tmpl):
+            self.templates.add(expr.name)
+            return
+        self.dynamic.add(str(expr))
+
+    def update(self, other: "SubroutineFootprint"):
+        for name in self.__slots__:  # type: ignore[attr-defined]
+            getattr(self, name).update(getattr(other, name))
+
+    def to_dict(self) -> dict:
+        return {name: sorted(getattr(self, name)) for name in self.__slots__}  # type: ignore[attr-defined]
+
+
+@dataclass(slots=True)
+class ProgramFootprint:
+    """
+    External resources read by a single program, by subroutine name (`main` for the program).
+
+    `subroutines` holds the resources read directly by each subroutine and `calls` the subroutines
+    called by each subroutine, see `footprint` for the resources read including those of callees.
+    """
+
+    subroutines: dict[str, SubroutineFootprint] = field(default_factory=dict)
+    calls: dict[str, set[str]] = field(default_factory=dict)
+
+    def footprint(self, name: str) -> SubroutineFootprint:
+        """Resources read by a subroutine (e.g. an ABI method), including the subroutines it calls."""
+        footprint = SubroutineFootprint()
+        seen, stack = {name}, [name]
+        while stack:
+            current = stack.pop()
+            if direct := self.subroutines.get(current):
+                footprint.update(direct)
+            for callee in self.calls.get(current, ()):
+                if callee not in seen:
+                    seen.add(callee)
+                    stack.append(callee)
+        return footprint
+
+    def to_dict(self) -> dict:
+        names = dict.fromkeys([*self.subroutines, *self.calls, *(c for cs in self.calls.values() for c in cs)])
+        return {name: self.footprint(name).to_dict() for name in names}
+
+
+@dataclass(slots=True)
+class ResourceFootprint:
+    """Resource footprints of every program compiled while collecting, in order of compilation."""
+
+    _programs: _Programs[ProgramFootprint] = field(default_factory=lambda: _Programs(ProgramFootprint), repr=False)
+
+    @property
+    def programs(self) -> list[ProgramFootprint]:
+        return self._programs.programs
+
+    def _record(self, expr: pt.Expr, options: "CompileOptions"):
+        program = self._programs.get(options)
+        subroutine = options.currentSubroutine
+        name = subroutine.name() if subroutine else MAIN
+
+        if isinstance(expr, pt.SubroutineCall):
+            program.calls.setdefault(name, set()).add(expr.subroutine.name())
+            return
+        if not isinstance(expr, _Getter):
+            return
+
+        footprint = program.subroutines.setdefault(name, SubroutineFootprint())
+        for role, arg in zip(_ROLES[expr.op], expr._args):
+            footprint._add(role, arg)
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Export the footprints as a JSON list with an object per program, holding the resources read
+        by each subroutine including the subroutines it calls.
+        """
+        return json.dumps([program.to_dict() for program in self.programs], **kwargs)
+
+
+@contextmanager
+def collect_footprint() -> typing.Iterator[ResourceFootprint]:
+    """
+    Collect the external resources read by programs compiled within the context, e.g.
+
+    ```python
+    with ptmn.collect_footprint() as footprint:
+        pt.compileTeal(program, mode=pt.Mode.Application, version=7)
+
+    footprint.to_json()
+    ```
+    """
+    footprint = ResourceFootprint()
+    token = observe(footprint._record, calls=True)
+    try:
+        yield footprint
+    finally:
+        unobserve(token)
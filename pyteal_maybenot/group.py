@@ -0,0 +1,35 @@
+from .expr.base import _Reader
+
+# ops between the read and the store when caching: assert / pop by cache(), swap by exists()
+_CACHING_OPS = {"assert", "pop", "swap"}
+
+
+def verify_group(teal: str, *readers: _Reader):
+    """
+    Check that a program compiled for a transaction of an atomic group caches the value of every
+    pinned reader that later transactions load through `gload()`, e.g.
+
+    ```python
+    teal = pt.compileTeal(first_program(), mode=pt.Mode.Application, version=7)
+    ptmn.verify_group(teal, oracle_price())
+    ```
+
+    Every slot must be stored into right after reading with the op and field of its reader. Raises
+    a ValueError listing the readers which are not cached in their slot.
+    """
+    lines = [line.strip() for line in teal.splitlines()]
+    missing: list[str] = []
+    for reader in readers:
+        if reader.slot is None:
+            raise ValueError("Cannot verify a reader unless pinned to a slot")
+
+        getter = reader._getter()
+        read = " ".join([str(getter.op), *getter._immediates()])
+        if not any(
+            line == f"store {reader.slot}" and lines[i - 1] in _CACHING_OPS and lines[i - 2] == read
+            for i, line in enumerate(lines)
+            if i >= 2
+        ):
+            missing.append(f"slot {reader.slot} ({read})")
+    if missing:
+        raise ValueError(f"Values not cached by the program: {', '.join(missing)}")
@@ -0,0 +1,87 @@
+import json
+import typing
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+import pyteal as pt
+
+from .expr.base import _CachedLoad, _Getter, _Programs, observe, unobserve
+
+if typing.TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+
+@dataclass(slots=True)
+class ProgramMetrics:
+    """Reader operations emitted while compiling a single program."""
+
+    # number of reads per opcode, e.g. {"asset_holding_get": 2}
+    reads: dict[str, int] = field(default_factory=dict)
+    # get() calls loading a value cached by exists(store=True)
+    cache_hits: int = 0
+    # get() calls reading the value again
+    cache_misses: int = 0
+    # distinct scratch slots stored into by exists(store=True) and cache()
+    slots: int = 0
+    # existence asserts emitted by get()
+    asserts: int = 0
+    _slots: set[pt.ScratchSlot] = field(default_factory=set, repr=False, compare=False)
+
+    def to_dict(self) -> dict:
+        return {name: value for name, value in asdict(self).items() if not name.startswith("_")}
+
+
+@dataclass(slots=True)
+class ReaderMetrics:
+    """Reader metrics of every program compiled while collecting, in order of compilation."""
+
+    _programs: _Programs[ProgramMetrics] = field(default_factory=lambda: _Programs(ProgramMetrics), repr=False)
+
+    @property
+    def programs(self) -> list[ProgramMetrics]:
+        return self._programs.programs
+
+    def _record(self, expr: pt.Expr, options: "CompileOptions"):
+        program = self._programs.get(options)
+
+        if isinstance(expr, _CachedLoad):
+            program.cache_hits += 1
+            return
+
+        if not isinstance(expr, _Getter):
+            return
+
+        program.reads[str(expr.op)] = program.reads.get(str(expr.op), 0) + 1
+        if expr._slot is not None:
+            program._slots.add(expr._slot)
+            program.slots = len(program._slots)
+        if not expr._get_exists:
+            # cache() reads the value to store it rather than reading it again
+            if expr._slot is None:
+                program.cache_misses += 1
+            if expr._assert_exists:
+                program.asserts += 1
+
+    def to_json(self, **kwargs) -> str:
+        """Export the metrics as a JSON list with an object per program."""
+        return json.dumps([program.to_dict() for program in self.programs], **kwargs)
+
+
+@contextmanager
+def collect_metrics() -> typing.Iterator[ReaderMetrics]:
+    """
+    Collect metrics of the reader operations emitted by programs compiled within the context, e.g.
+
+    ```python
+    with ptmn.collect_metrics() as metrics:
+        pt.compileTeal(program, mode=pt.Mode.Application, version=7)
+
+    metrics.to_json()
+    ```
+    """
+    metrics = ReaderMetrics()
+    token = observe(metrics._record)
+    try:
+        yield metrics
+    finally:
+        unobserve(token)
@@ -0,0 +1,527 @@
+"""
+Rewrite PyTeal MaybeValue reads of external state into the equivalent readers of this package.
+
+Bindings of the form `x = pt.App.globalGetEx(app, key)` (likewise `App.localGetEx`,
+`AssetHolding.*`, `AssetParam.*`, `AppParam.*` and `AccountParam.*`) are rewritten when every use
+of `x` is in the enclosing scope (not in nested functions or lambdas) and is one of the following:
+
+- `x` as an element of `Seq`, which evaluates the MaybeValue and is removed
+- `Assert(x.hasValue())` as an element of `Seq`, which is removed in favour of the assert
+  performed by `x.get()` if a following element always evaluates `x.value()`, and rewritten into
+  `Assert(x.exists(store=False))` otherwise
+- `If(x.hasValue(), x.value(), default)`, which is rewritten into `x.get_or(default)`
+- `x.hasValue()` and `x.value()`, which are rewritten into `x.exists()` and `x.get()`, the latter
+  with `assert_exists=False` unless following an assert as above
+
+As removing the `x` elements moves the read to every use, bindings are only rewritten if every use
+follows an `x` element in the same `Seq`, with no call in between which may change state or
+scratch slots (e.g. `store()`, inner transactions or calls of functions such as subroutines).
+Other bindings are left untouched and reported as skipped.
+
+Usage: `python -m pyteal_maybenot.migrate [--write] [--compile NAME ...] FILE ...`
+"""
+import argparse
+import ast
+import builtins
+import difflib
+import sys
+import typing
+from dataclasses import dataclass, field
+
+from ._program import compile_file
+from .expr.params import _ACCT_PARAMS_MAP, _APP_PARAMS_MAP, _ASSET_HOLDING_MAP, _ASSET_PARAMS_MAP
+
+
+def _camel(name: str) -> str:
+    first, *rest = name.split("_")
+    return first + "".join(part.capitalize() for part in rest)
+
+
+# (PyTeal class, method) -> (reader, field)
+_READERS: dict[tuple[str, str], tuple[str, str | None]] = {
+    ("App", "globalGetEx"): ("ExAppGlobal", None),
+    ("App", "localGetEx"): ("ExAppLocal", None),
+    **{("AssetHolding", _camel(f)): ("AssetHolding", f) for f in _ASSET_HOLDING_MAP},
+    **{("AssetParam", _camel(f)): ("AssetParams", f) for f in _ASSET_PARAMS_MAP},
+    **{("AppParam", _camel(f)): ("AppParams", f) for f in _APP_PARAMS_MAP},
+    **{("AccountParam", _camel(f)): ("AcctParams", f) for f in _ACCT_PARAMS_MAP},
+}
+# classes whose methods all return MaybeValues
+_OWNERS = {owner for owner, _ in _READERS} - {"App"}
+
+
+@dataclass(slots=True)
+class Rewrite:
+    """Result of rewriting a single source file."""
+
+    source: str
+    # number of MaybeValue bindings rewritten
+    rewritten: int = 0
+    # (line, reason) of MaybeValue bindings left untouched
+    skipped: list[tuple[int, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _Binding:
+    name: str
+    call: ast.Call
+    reader: str
+    field_name: str | None
+    seq: list[ast.expr] = field(default_factory=list)
+    has_value: list[ast.Call] = field(default_factory=list)
+    value: list[ast.Call] = field(default_factory=list)
+    get_or: list[ast.Call] = field(default_factory=list)
+    # Assert(x.hasValue()) elements of Seq calls
+    asserts: list[ast.Call] = field(default_factory=list)
+
+
+def _dotted(node: ast.expr) -> list[str]:
+    names = []
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        names.append(node.id)
+    return names[::-1]
+
+
+def _is_call_to(node: ast.AST | None, name: str) -> typing.TypeGuard[ast.Call]:
+    return isinstance(node, ast.Call) and _dotted(node.func)[-1:] == [name]
+
+
+# calls evaluating their arguments conditionally, or not at all
+_CONDITIONALS = {"If", "Cond", "And", "Or", "While", "For", "Switch", "Subroutine", "ABIReturnSubroutine"}
+
+
+def _scope_nodes(scope: ast.AST) -> typing.Iterator[ast.AST]:
+    # walk the scope without descending into nested scopes
+    stack = list(ast.iter_child_nodes(scope))
+    while stack:
+        node = stack.pop()
+        yield node
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            stack.extend(ast.iter_child_nodes(node))
+
+
+class _Source:
+    """Source text addressed by the (line, utf-8 column) positions of ast nodes."""
+
+    def __init__(self, source: str):
+        self.data = source.encode()
+        self._lines = [0]
+        for line in source.encode().splitlines(keepends=True):
+            self._lines.append(self._lines[-1] + len(line))
+
+    def start(self, node: ast.AST) -> int:
+        return self._lines[node.lineno - 1] + node.col_offset  # type: ignore[attr-defined]
+
+    def end(self, node: ast.AST) -> int:
+        return self._lines[node.end_lineno - 1] + node.end_col_offset  # type: ignore[attr-defined]
+
+    def text(self, node: ast.AST) -> str:
+        return self.data[self.start(node) : self.end(node)].decode()
+
+
+def _seq_elements(node: ast.AST, parents: dict[ast.AST, ast.AST]) -> tuple[ast.Call, list[ast.expr]] | None:
+    # Seq(a, b, ...) or Seq([a, b, ...])
+    parent = parents.get(node)
+    if isinstance(parent, ast.List) and _is_call_to(seq := parents.get(parent), "Seq") and seq.args == [parent]:
+        return seq, parent.elts
+    if _is_call_to(parent, "Seq") and node in parent.args:
+        return parent, parent.args
+    return None
+
+
+def _path(node: ast.AST, ancestor: ast.AST, parents: dict[ast.AST, ast.AST]) -> list[ast.AST] | None:
+    """Ancestors of the node up to the given ancestor, or None if the node does not descend from it."""
+    path = []
+    while node is not ancestor:
+        if (parent := parents.get(node)) is None:
+            return None
+        node = parent
+        path.append(node)
+    return path
+
+
+def _unconditional(node: ast.AST, ancestor: ast.AST, parents: dict[ast.AST, ast.AST]) -> bool:
+    """Whether the node descends from the ancestor and is evaluated whenever the ancestor is."""
+    path = _path(node, ancestor, parents)
+    return path is not None and not any(_is_call_to(n, name) for n in path for name in _CONDITIONALS)
+
+
+def _following(node: ast.expr, parents: dict[ast.AST, ast.AST]) -> list[ast.expr]:
+    """Elements following an element of a Seq."""
+    _, elements = typing.cast(tuple[ast.Call, list[ast.expr]], _seq_elements(node, parents))
+    return elements[elements.index(node) + 1 :]
+
+
+def _assert_kept(binding: _Binding, assert_: ast.Call, parents: dict[ast.AST, ast.AST]) -> bool:
+    """Whether a value() call following the assert in its Seq is always evaluated, keeping the assert."""
+    return any(
+        _unconditional(call, element, parents) for element in _following(assert_, parents) for call in binding.value
+    )
+
+
+def _asserted(binding: _Binding, call: ast.Call, parents: dict[ast.AST, ast.AST]) -> bool:
+    """Whether a value() call follows an assert of the existence of the value in its Seq."""
+    return any(
+        _path(call, element, parents) is not None
+        for assert_ in binding.asserts
+        for element in _following(assert_, parents)
+    )
+
+
+# calls which may change state, or scratch slots read by the arguments of a MaybeValue
+_EFFECTS = {
+    "store",
+    "store_into",
+    "set",
+    "decode",
+    "put",
+    "replace",
+    "delete",
+    "create",
+    "resize",
+    "globalPut",
+    "globalDel",
+    "localPut",
+    "localDel",
+    "Begin",
+    "Next",
+    "SetField",
+    "SetFields",
+    "Submit",
+    "Execute",
+    "MethodCall",
+    "ExecuteMethodCall",
+}
+# calls evaluating their arguments repeatedly
+_LOOPS = {"While", "For", "Do"}
+
+
+def _effects(node: ast.AST) -> list[ast.Call]:
+    """Calls within a node which may change state, including calls of functions such as subroutines."""
+    return [
+        n
+        for n in ast.walk(node)
+        if isinstance(n, ast.Call)
+        and (
+            not (names := _dotted(n.func))
+            or names[-1] in _EFFECTS
+            or (len(names) == 1 and names[0][:1].islower() and not hasattr(builtins, names[0]))
+        )
+    ]
+
+
+def _before(node: ast.AST, other: ast.AST) -> bool:
+    return (node.end_lineno, node.end_col_offset) <= (other.lineno, other.col_offset)  # type: ignore[attr-defined]
+
+
+def _moved_read(binding: _Binding, uses: list[ast.Name], parents: dict[ast.AST, ast.AST]) -> str | None:
+    """
+    Reason for skipping a binding if removing its Seq elements, which moves the read to every use,
+    could change the value read, i.e. if state may change between the element and a use.
+    """
+    if not binding.seq:
+        return None
+    for use in sorted(uses, key=lambda n: (n.lineno, n.col_offset)):
+        if use in binding.seq:
+            continue
+        node: ast.AST = use
+        loop = False
+        while (parent := parents.get(node)) is not None:
+            seq = _seq_elements(node, parents)
+            if seq and (evaluated := [i for i, e in enumerate(seq[1]) if e in binding.seq and e is not node]):
+                elements = seq[1]
+                index = elements.index(typing.cast(ast.expr, node))
+                if evaluated[0] > index:
+                    return f"{binding.name} used before it is evaluated"
+                between = elements[max(i for i in evaluated if i < index) + 1 : index]
+                # within the element of the use, only calls evaluated before the use matter, unless in a loop
+                if any(_effects(e) for e in between) or any(loop or _before(c, use) for c in _effects(node)):
+                    return f"state may change between evaluating {binding.name} and its use on line {use.lineno}"
+                break
+            node = parent
+            loop = loop or any(_is_call_to(node, name) for name in _LOOPS)
+        else:
+            return f"{binding.name} used outside of the Seq evaluating it"
+    return None
+
+
+def _collect(binding: _Binding, uses: list[ast.Name], parents: dict[ast.AST, ast.AST]) -> str | None:
+    """Classify the uses of a binding, returning the reason for skipping it if not supported."""
+    for use in uses:
+        attr = parents.get(use)
+        call = parents.get(attr) if attr else None
+        if isinstance(attr, ast.Attribute) and isinstance(call, ast.Call) and call.func is attr:
+            if call.args or call.keywords or attr.attr not in ("hasValue", "value"):
+                return f"unsupported use {attr.attr}() of {binding.name}"
+            if attr.attr == "value":
+                if call not in binding.value:
+                    binding.value.append(call)
+                continue
+            outer = parents.get(call)
+            if _is_call_to(outer, "Assert") and outer.args == [call] and _seq_elements(outer, parents):
+                binding.asserts.append(outer)
+            elif (
+                _is_call_to(outer, "If")
+                and len(outer.args) == 3
+                and not outer.keywords
+                and outer.args[0] is call
+                and isinstance(value := outer.args[1], ast.Call)
+                and _dotted(value.func) == [binding.name, "value"]
+                and not value.args
+            ):
+                binding.get_or.append(outer)
+            else:
+                binding.has_value.append(call)
+        elif _seq_elements(use, parents):
+            binding.seq.append(use)
+        else:
+            return f"{binding.name} used outside of hasValue(), value() and Seq"
+    # value() calls within the If idiom are covered by get_or
+    covered = {id(c.args[1]) for c in binding.get_or}
+    binding.value = [c for c in binding.value if id(c) not in covered]
+    return None
+
+
+def rewrite(source: str) -> Rewrite:
+    """Rewrite the MaybeValue reads of a Python source file."""
+    tree = ast.parse(source)
+    src = _Source(source)
+    parents = {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+    result = Rewrite(source)
+
+    prefix = "ptmn"
+    imported = False
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == "pyteal_maybenot":
+                    prefix, imported = alias.asname or alias.name, True
+
+    bindings: list[_Binding] = []
+    for scope in ast.walk(tree):
+        if not isinstance(scope, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        nodes = list(_scope_nodes(scope))
+        scope_nodes = set(nodes)
+        stores: dict[str, int] = {}
+        for n in nodes:
+            if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store):
+                stores[n.id] = stores.get(n.id, 0) + 1
+
+        for call in nodes:
+            if not isinstance(call, ast.Call) or len(key := tuple(_dotted(call.func)[-2:])) != 2:
+                continue
+            if key not in _READERS:
+                if key[0] in _OWNERS:
+                    result.skipped.append((call.lineno, f"no reader for {'.'.join(key)}"))
+                continue
+            assign = parents[call]
+            if not (
+                isinstance(assign, ast.Assign) and len(assign.targets) == 1 and isinstance(assign.targets[0], ast.Name)
+            ):
+                result.skipped.append((call.lineno, "not assigned to a single name"))
+                continue
+            target = assign.targets[0]
+            reader, field_ = _READERS[typing.cast(tuple[str, str], key)]
+            binding = _Binding(target.id, call, reader, field_)
+            if call.keywords or any(isinstance(arg, ast.Starred) for arg in call.args):
+                reason: str | None = "unsupported arguments"
+            elif stores[target.id] > 1:
+                reason = f"{target.id} assigned more than once"
+            elif any(
+                isinstance(n, ast.Name) and n.id == target.id and n not in scope_nodes
+                for nested in nodes
+                if isinstance(nested, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda))
+                for n in ast.walk(nested)
+            ):
+                reason = f"{target.id} used in a nested scope"
+            else:
+                uses = [
+                    n for n in nodes if isinstance(n, ast.Name) and n.id == target.id and isinstance(n.ctx, ast.Load)
+                ]
+                reason = _collect(binding, uses, parents) or _moved_read(binding, uses, parents)
+            if reason:
+                result.skipped.append((assign.lineno, reason))
+            else:
+                bindings.append(binding)
+
+    result.skipped.sort()
+    names = {binding.name for binding in bindings}
+    edits: list[tuple[int, int, str]] = []
+    removals: dict[int, tuple[ast.Call, list[ast.expr], set[int]]] = {}
+    for binding in bindings:
+        call = binding.call
+        edits.append((src.start(call.func), src.end(call.func), f"{prefix}.{binding.reader}"))
+        if binding.field_name:
+            edits.append((src.end(call.args[-1]), src.end(call.args[-1]), f', "{binding.field_name}"'))
+        for assert_ in binding.asserts:
+            if not _assert_kept(binding, assert_, parents):
+                # nothing else asserts that the value exists
+                has_value = typing.cast(ast.Call, assert_.args[0])
+                edits.append((src.start(has_value), src.end(has_value), f"{binding.name}.exists(store=False)"))
+                continue
+            binding.seq.append(assert_)
+        for element in binding.seq:
+            seq, elements = typing.cast(tuple[ast.Call, list[ast.expr]], _seq_elements(element, parents))
+            removals.setdefault(id(seq), (seq, elements, set()))[2].add(elements.index(element))
+        for if_ in binding.get_or:
+            default = if_.args[2]
+            if any(isinstance(n, ast.Name) and n.id in names for n in ast.walk(default)):
+                # nested rewrites within the default, fall back to exists() and get()
+                binding.has_value.append(typing.cast(ast.Call, if_.args[0]))
+                binding.value.append(typing.cast(ast.Call, if_.args[1]))
+                continue
+            edits.append((src.start(if_), src.end(if_), f"{binding.name}.get_or({src.text(default)})"))
+        for call in binding.has_value:
+            edits.append((src.start(call), src.end(call), f"{binding.name}.exists()"))
+        for call in binding.value:
+            asserted = _asserted(binding, call, parents)
+            get = f"{binding.name}.get()" if asserted else f"{binding.name}.get(assert_exists=False)"
+            edits.append((src.start(call), src.end(call), get))
+        result.rewritten += 1
+
+    for seq, elements, indices in removals.values():
+        if len(indices) == len(elements):
+            raise ValueError(f"Cannot remove all elements of Seq on line {seq.lineno}")
+        # remove runs of consecutive elements along with their separators
+        for run in _runs(sorted(indices)):
+            first, last = run[0], run[-1]
+            if last < len(elements) - 1:
+                edits.append((src.start(elements[first]), src.start(elements[last + 1]), ""))
+            else:
+                edits.append((src.end(elements[first - 1]), src.end(elements[last]), ""))
+
+    if bindings and not imported:
+        imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+        if imports:
+            edits.append((src.end(imports[-1]), src.end(imports[-1]), "\nimport pyteal_maybenot as ptmn"))
+        else:
+            edits.append((0, 0, "import pyteal_maybenot as ptmn\n"))
+
+    data = src.data
+    for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1]), reverse=True):
+        data = data[:start] + text.encode() + data[end:]
+    result.source = data.decode()
+    return result
+
+
+def _runs(indices: list[int]) -> list[list[int]]:
+    runs: list[list[int]] = []
+    for i in indices:
+        if runs and runs[-1][-1] == i - 1:
+            runs[-1].append(i)
+        else:
+            runs.append([i])
+    return runs
+
+
+def _varuint_size(value: int) -> int:
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def _bytes_size(value: str) -> int:
+    size = len(value[2:]) // 2 if value.startswith("0x") else len(value.strip('"'))
+    return _varuint_size(size) + size
+
+
+def program_size(teal: str) -> tuple[int, int]:
+    """
+    Count the ops of a TEAL program compiled with `assembleConstants` enabled, along with an
+    estimate of its size in bytes (opcode and immediates of each op, plus the version prefix).
+    """
+    ops, size = 0, 0
+    for line in teal.splitlines():
+        line = line.split("//")[0].strip()
+        if line.startswith("#pragma version"):
+            size += _varuint_size(int(line.split()[-1]))
+            continue
+        if not line or line.endswith(":"):
+            continue
+        op, *args = line.split()
+        ops += 1
+        if op == "intcblock":
+            size += 1 + _varuint_size(len(args)) + sum(_varuint_size(int(arg)) for arg in args)
+        elif op == "bytecblock":
+            size += 1 + _varuint_size(len(args)) + sum(_bytes_size(arg) for arg in args)
+        elif op == "pushint":
+            size += 1 + _varuint_size(int(args[0]))
+        elif op == "pushbytes":
+            size += 1 + _bytes_size(args[0])
+        elif op in ("b", "bz", "bnz", "callsub"):
+            size += 3
+        elif op in ("switch", "match"):
+            size += 2 + 2 * len(args)
+        else:
+            size += 1 + len(args)
+    return ops, size
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pyteal_maybenot.migrate", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("files", nargs="+", metavar="FILE")
+    parser.add_argument("--write", action="store_true", help="rewrite files in place instead of printing a diff")
+    parser.add_argument(
+        "--compile",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="function returning a program to compile before and after rewriting, to report savings",
+    )
+    parser.add_argument("--mode", choices=["application", "signature"], default="application")
+    parser.add_argument("--version", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    status = 0
+    for path in args.files:
+        with open(path) as f:
+            source = f.read()
+        result = rewrite(source)
+        print(f"{path}: {result.rewritten} rewritten, {len(result.skipped)} skipped")
+        for line, reason in result.skipped:
+            print(f"  line {line}: {reason}")
+
+        failed = False
+        for name in args.compile:
+            try:
+                before = program_size(
+                    compile_file(source, path, name, args.mode, args.version, assemble_constants=True)
+                )
+                after = program_size(
+                    compile_file(result.source, path, name, args.mode, args.version, assemble_constants=True)
+                )
+            except Exception as e:
+                # report the file and keep going, leaving it untouched
+                print(f"  {name}: compile failed: {e.__class__.__name__}: {e}")
+                failed = True
+                continue
+            print(
+                f"  {name}: {before[0]} -> {after[0]} ops ({before[0] - after[0]} saved), "
+                f"~{before[1]} -> ~{after[1]} bytes ({before[1] - after[1]} saved)"
+            )
+        if failed:
+            status = 1
+            continue
+
+        if args.write:
+            if result.source != source:
+                with open(path, "w") as f:
+                    f.write(result.source)
+        else:
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    source.splitlines(keepends=True),
+                    result.source.splitlines(keepends=True),
+                    fromfile=path,
+                    tofile=path,
+                )
+            )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
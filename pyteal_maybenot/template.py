@@ -0,0 +1,95 @@
+import re
+import typing
+
+from algosdk import encoding
+
+_PLACEHOLDER = re.compile(r"(TMPL_[A-Z0-9_]+)")
+
+# ops taking template placeholders, by kind of value substituted
+_INT_OPS = {"int", "pushint", "intcblock"}
+_BYTES_OPS = {"byte"}
+_ADDR_OPS = {"addr"}
+# byte constants assembled by PyTeal, from both byte and addr ops
+_CONSTANT_OPS = {"pushbytes", "bytecblock"}
+_KINDS = {
+    **dict.fromkeys(_INT_OPS, "int"),
+    **dict.fromkeys(_BYTES_OPS, "bytes"),
+    **dict.fromkeys(_ADDR_OPS, "addr"),
+    **dict.fromkeys(_CONSTANT_OPS, "bytes or addr"),
+}
+
+
+def _format(name: str, kind: str, value: int | bytes | str) -> str:
+    match kind, value:
+        case "int", bool():
+            pass
+        case "int", int():
+            if not 0 <= value < 2**64:
+                raise ValueError(f"Value for {name} out of uint64 range: {value}")
+            return str(value)
+        case "bytes" | "bytes or addr", bytes():
+            return "0x" + value.hex()
+        case "bytes or addr", str() if encoding.is_valid_address(value):
+            return "0x" + encoding.decode_address(value).hex()
+        case "addr", str() if encoding.is_valid_address(value):
+            return value
+    raise TypeError(f"Invalid value for {name} in {kind} op: {value!r}")
+
+
+class Template:
+    """
+    Compiled TEAL program with template placeholders (see `pt.Tmpl`), which is rendered into
+    variants by substituting the placeholders, rather than compiling every variant from scratch.
+
+    Placeholders in `int` ops take uint64 integers, placeholders in `byte` ops take bytes and
+    placeholders in `addr` ops take addresses. Programs compiled with `assembleConstants` are
+    supported as well, where placeholders of byte constants take either bytes or addresses. Values
+    of other types, and strings which are not valid addresses, raise a TypeError.
+    """
+
+    def __init__(self, teal: str):
+        # text and (placeholder, kind) parts, split once to render by joining
+        self._parts: list[str | tuple[str, str]] = []
+        for line in teal.splitlines(keepends=True):
+            if "TMPL_" not in line:
+                self._parts.append(line)
+                continue
+            # comments of constants assembled by PyTeal repeat the placeholder, keep those as is
+            code, sep, comment = line.partition("//")
+            op = code.split(maxsplit=1)[0] if code.strip() else ""
+            kind = _KINDS.get(op)
+            for i, part in enumerate(_PLACEHOLDER.split(code)):
+                if i % 2 == 0:
+                    self._parts.append(part)
+                elif kind is None:
+                    raise ValueError(f"Unexpected template placeholder {part} in: {line.strip()}")
+                else:
+                    self._parts.append((part, kind))
+            self._parts.append(sep + comment)
+        # merge consecutive text parts
+        parts: list[str | tuple[str, str]] = []
+        for part in self._parts:
+            if parts and isinstance(part, str) and isinstance(parts[-1], str):
+                parts[-1] += part
+            else:
+                parts.append(part)
+        self._parts = parts
+        self.names = frozenset(part[0] for part in self._parts if isinstance(part, tuple))
+
+    def render(self, values: typing.Mapping[str, int | bytes | str]) -> str:
+        """Substitute the placeholders of the template by the given values."""
+        if missing := self.names - values.keys():
+            raise ValueError(f"Missing template values: {', '.join(sorted(missing))}")
+        if unknown := values.keys() - self.names:
+            raise ValueError(f"Unknown template values: {', '.join(sorted(unknown))}")
+
+        formatted: dict[tuple[str, str], str] = {}
+        rendered = []
+        for part in self._parts:
+            if isinstance(part, tuple):
+                if (text := formatted.get(part)) is None:
+                    text = formatted[part] = _format(*part, values[part[0]])
+                rendered.append(text)
+            else:
+                rendered.append(part)
+        return "".join(rendered)
@@ -1,4 +1,5 @@
 import pyteal as pt
+import pytest
 
 import pyteal_maybenot as ptmn
 
@@ -168,3 +169,65 @@ def test_no_cache_on_inline():
         return
         """
     )
+
+
+def test_cache_hoisted():
+    # test that a read cached ahead of a loop is loaded within the loop
+    min_balance = ptmn.AcctParams(pt.Txn.sender(), "min_balance")
+    i = pt.ScratchVar()
+    teal = compile(
+        min_balance.cache(),
+        pt.For(i.store(pt.Int(0)), i.load() < pt.Int(4), i.store(i.load() + pt.Int(1))).Do(
+            pt.Assert(min_balance.get())
+        ),
+        pt.Int(1),
+    )
+    assert teal == format_teal(
+        """
+        txn Sender
+        acct_params_get AcctMinBalance
+        assert
+        store 1
+        int 0
+        store 0
+        main_l1:
+        load 0
+        int 4
+        <
+        bz main_l3
+        load 1
+        assert
+        load 0
+        int 1
+        +
+        store 0
+        b main_l1
+        main_l3:
+        int 1
+        return
+        """
+    )
+
+
+def test_cache_without_assert():
+    name = ptmn.AssetParams(pt.Txn.assets[0], "name")
+    teal = compile(name.cache(assert_exists=False), pt.Len(name.get(assert_exists=False)))
+    assert teal == format_teal(
+        """
+        txna Assets 0
+        asset_params_get AssetName
+        pop
+        store 0
+        load 0
+        len
+        return
+        """
+    )
+
+
+def test_cache_without_assert_get_asserted():
+    # test that the assert of get() is not silently dropped for values cached without assert
+    name = ptmn.AssetParams(pt.Txn.assets[0], "name")
+    name.cache(assert_exists=False)
+    with pytest.raises(ValueError):
+        name.get()
@@ -0,0 +1,160 @@
+import pyteal as pt
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, format_teal
+
+
+def test_all_exist():
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    min_balance = ptmn.AcctParams(pt.Txn.sender(), "min_balance")
+    teal = compile(ptmn.all_exist(balance, min_balance))
+    assert teal == format_teal(
+        """
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        store 0
+        dup
+        bnz main_l2
+        int 0
+        store 1
+        b main_l3
+        main_l2:
+        pop
+        txn Sender
+        acct_params_get AcctMinBalance
+        swap
+        store 1
+        main_l3:
+        return
+        """
+    )
+
+
+def test_any_exist_without_cache():
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    min_balance = ptmn.AcctParams(pt.Txn.sender(), "min_balance")
+    teal = compile(ptmn.any_exist(balance, min_balance, store=False))
+    assert teal == format_teal(
+        """
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        pop
+        dup
+        bnz main_l2
+        pop
+        txn Sender
+        acct_params_get AcctMinBalance
+        swap
+        pop
+        main_l2:
+        return
+        """
+    )
+
+
+def test_cache_after_all_exist():
+    # test that values read in the chain are loaded from cache afterwards
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    min_balance = ptmn.AcctParams(pt.Txn.sender(), "min_balance")
+    teal = compile(pt.If(ptmn.all_exist(balance, min_balance), balance.get() - min_balance.get(), pt.Int(0)))
+    assert teal == format_teal(
+        """
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        store 0
+        dup
+        bnz main_l5
+        int 0
+        store 1
+        main_l2:
+        bnz main_l4
+        int 0
+        b main_l6
+        main_l4:
+        load 0
+        load 1
+        -
+        b main_l6
+        main_l5:
+        pop
+        txn Sender
+        acct_params_get AcctMinBalance
+        swap
+        store 1
+        b main_l2
+        main_l6:
+        return
+        """
+    )
+
+
+def test_no_fill_on_previous_cache():
+    # test that skipping a reader which was cached beforehand does not overwrite its cached value
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    min_balance = ptmn.AcctParams(pt.Txn.sender(), "min_balance")
+    teal = compile(pt.Pop(min_balance.exists()), ptmn.all_exist(balance, min_balance))
+    assert teal == format_teal(
+        """
+        txn Sender
+        acct_params_get AcctMinBalance
+        swap
+        store 0
+        pop
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        store 1
+        dup
+        bz main_l2
+        pop
+        txn Sender
+        acct_params_get AcctMinBalance
+        swap
+        store 0
+        main_l2:
+        return
+        """
+    )
+
+
+def test_read_after_any_exist():
+    # test that values which may have been skipped on the true path are read again
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    min_balance = ptmn.AcctParams(pt.Txn.sender(), "min_balance")
+    teal = compile(pt.If(ptmn.any_exist(balance, min_balance), balance.get() + min_balance.get(), pt.Int(0)))
+    assert teal == format_teal(
+        """
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        store 0
+        dup
+        bnz main_l2
+        pop
+        txn Sender
+        acct_params_get AcctMinBalance
+        swap
+        pop
+        main_l2:
+        bnz main_l4
+        int 0
+        b main_l5
+        main_l4:
+        load 0
+        txn Sender
+        acct_params_get AcctMinBalance
+        assert
+        +
+        main_l5:
+        return
+        """
+    )
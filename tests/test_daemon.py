@@ -0,0 +1,88 @@
+import os
+import stat
+import threading
+from textwrap import dedent
+
+import pyteal as pt
+import pytest
+
+import pyteal_maybenot as ptmn
+from pyteal_maybenot.daemon import CompileServer, main, request
+
+from .utils import compile
+
+CONTRACT = dedent(
+    """
+    import pyteal as pt
+
+    import pyteal_maybenot as ptmn
+
+
+    def approval():
+        return ptmn.AssetParams(pt.Txn.assets[0], "decimals").get()
+    """
+)
+
+
+@pytest.fixture
+def server(tmp_path):
+    with CompileServer(str(tmp_path / "daemon.sock")) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield server
+        server.shutdown()
+        thread.join()
+
+
+def test_compile(server, tmp_path, capsys):
+    contract = tmp_path / "contract.py"
+    contract.write_text(CONTRACT)
+    socket = server.server_address
+
+    assert main(["--socket", socket, "compile", str(contract), "approval"]) == 0
+    assert capsys.readouterr().out == compile(ptmn.AssetParams(pt.Txn.assets[0], "decimals").get()) + "\n"
+
+    # test that the program is only compiled again when the file changes
+    response = request({"file": str(contract), "name": "approval"}, socket)
+    assert response["cached"]
+    contract.write_text(CONTRACT.replace('"decimals"', '"total"'))
+    response = request({"file": str(contract), "name": "approval"}, socket)
+    assert not response["cached"]
+    assert response["teal"] == compile(ptmn.AssetParams(pt.Txn.assets[0], "total").get())
+
+
+def test_compile_error(server, tmp_path, capsys):
+    contract = tmp_path / "contract.py"
+    contract.write_text(CONTRACT.replace('"decimals"', '"unknown"'))
+
+    assert main(["--socket", server.server_address, "compile", str(contract), "approval"]) == 1
+    assert capsys.readouterr().err == "ValueError: unknown not a valid field in _GetAssetParams\n"
+    assert "error" in request({"name": "approval"}, server.server_address)
+    # test that requests which are not objects are answered with an error
+    assert request([1], server.server_address) == {"error": "Invalid request: expected a JSON object"}  # type: ignore[arg-type]
+    assert "error" in request({"file": 0, "name": "approval"}, server.server_address)
+
+
+def test_compile_relative(server, tmp_path, monkeypatch, capsys):
+    contract = tmp_path / "contract.py"
+    contract.write_text(CONTRACT)
+    socket = server.server_address
+
+    # test that relative paths are resolved by the client rather than by the server
+    monkeypatch.chdir(tmp_path)
+    assert main(["--socket", socket, "compile", "contract.py", "approval"]) == 0
+    assert capsys.readouterr().out == compile(ptmn.AssetParams(pt.Txn.assets[0], "decimals").get()) + "\n"
+    assert request({"file": "contract.py", "name": "approval"}, socket) == {
+        "error": "Invalid request: file must be an absolute path"
+    }
+
+
+def test_socket_private(server, tmp_path):
+    assert stat.S_IMODE(os.stat(server.server_address).st_mode) == 0o600
+
+    # test that sockets in directories writable by others are rejected
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(ValueError):
+        CompileServer(str(shared / "daemon.sock"))
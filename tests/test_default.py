@@ -0,0 +1,50 @@
+import pyteal as pt
+import pytest
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, compile_popped, format_teal
+
+
+def test_get_or():
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    teal = compile(balance.get_or(pt.Int(0)) + pt.Int(1))
+    assert teal == format_teal(
+        """
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        bnz main_l2
+        pop
+        int 0
+        main_l2:
+        int 1
+        +
+        return
+        """
+    )
+
+
+def test_get_or_any_type():
+    # test that default type is not restricted for any-typed external app state
+    key = ptmn.ExAppGlobal(pt.Txn.applications[1], pt.Bytes("key"))
+    teal = compile_popped(key.get_or(pt.Bytes("none")))
+    assert teal == format_teal(
+        """
+        txna Applications 1
+        byte "key"
+        app_global_get_ex
+        bnz main_l2
+        pop
+        byte "none"
+        main_l2:
+        pop
+        int 1
+        return
+        """
+    )
+
+
+def test_get_or_type_mismatch():
+    with pytest.raises(pt.TealTypeError):
+        ptmn.AssetParams(pt.Txn.assets[0], "decimals").get_or(pt.Bytes("none"))
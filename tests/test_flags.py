@@ -0,0 +1,133 @@
+import pyteal as pt
+import pytest
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, format_teal
+
+
+def test_flag_cache():
+    flags = ptmn.FlagCache()
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    auth_addr = ptmn.AcctParams(pt.Txn.sender(), "auth_addr")
+    teal = compile(
+        flags.clear(),
+        pt.Pop(balance.exists(flags=flags)),
+        pt.Pop(auth_addr.exists(store=False, flags=flags)),
+        # flags are loaded from their cached bits
+        pt.If(pt.And(balance.exists(), auth_addr.exists()), balance.get(), pt.Int(0)),
+    )
+    assert teal == format_teal(
+        """
+        int 0
+        store 0
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        store 1
+        load 0
+        int 0
+        dig 2
+        setbit
+        store 0
+        pop
+        txn Sender
+        acct_params_get AcctAuthAddr
+        swap
+        pop
+        load 0
+        int 1
+        dig 2
+        setbit
+        store 0
+        pop
+        load 0
+        int 0
+        getbit
+        load 0
+        int 1
+        getbit
+        &&
+        bnz main_l2
+        int 0
+        b main_l3
+        main_l2:
+        load 1
+        main_l3:
+        return
+        """
+    )
+
+
+def test_flag_cache_no_load():
+    # test that the cached flag is ignored when explicitly disabling loading
+    flags = ptmn.FlagCache()
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    teal = compile(flags.clear(), pt.Pop(balance.exists(store=False, flags=flags)), balance.exists(load=False))
+    assert teal == format_teal(
+        """
+        int 0
+        store 0
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        pop
+        load 0
+        int 0
+        dig 2
+        setbit
+        store 0
+        pop
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        store 1
+        return
+        """
+    )
+
+
+def test_flag_cache_full():
+    flags = ptmn.FlagCache()
+    for i in range(64):
+        ptmn.AssetParams(pt.Int(i), "decimals").exists(store=False, flags=flags)
+    with pytest.raises(ValueError):
+        ptmn.AssetParams(pt.Int(64), "decimals").exists(store=False, flags=flags)
+
+
+def test_flag_cache_conditional():
+    # test that the cached flag is loaded even on paths not caching it, which must be avoided by the caller
+    flags = ptmn.FlagCache()
+    balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+    teal = compile(
+        flags.clear(),
+        pt.If(pt.Txn.fee()).Then(pt.Pop(balance.exists(store=False, flags=flags))),
+        balance.exists(),
+    )
+    assert teal == format_teal(
+        """
+        int 0
+        store 0
+        txn Fee
+        bz main_l2
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        swap
+        pop
+        load 0
+        int 0
+        dig 2
+        setbit
+        store 0
+        pop
+        main_l2:
+        load 0
+        int 0
+        getbit
+        return
+        """
+    )
@@ -0,0 +1,101 @@
+import json
+
+import pyteal as pt
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile
+
+ADDRESS = "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+EMPTY: dict[str, list] = {
+    "accounts": [],
+    "applications": [],
+    "assets": [],
+    "addresses": [],
+    "app_ids": [],
+    "asset_ids": [],
+    "keys": [],
+    "templates": [],
+    "dynamic": [],
+}
+
+
+def test_footprint():
+    @pt.Subroutine(pt.TealType.uint64)
+    def price():
+        return (
+            ptmn.ExAppGlobal(pt.Txn.applications[1], pt.Bytes("price")).get()
+            + ptmn.AssetParams(pt.Int(123), "decimals").get()
+        )
+
+    with ptmn.collect_footprint() as footprint:
+        compile(
+            pt.Pop(ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance").get()),
+            pt.Pop(ptmn.AcctParams(pt.Txn.accounts[pt.Int(2)], "balance").get()),
+            pt.Pop(ptmn.AcctParams(pt.Txn.accounts[pt.Txn.group_index()], "balance").get()),
+            pt.Pop(ptmn.ExAppLocal(pt.Addr(ADDRESS), pt.Tmpl.Int("TMPL_APP"), pt.Bytes("base16", "0x01")).get()),
+            price(),
+        )
+
+    assert json.loads(footprint.to_json()) == [
+        {
+            "main": {
+                **EMPTY,
+                # including the reads of the price subroutine
+                "accounts": [2],
+                "applications": [1],
+                "assets": [0],
+                "addresses": [ADDRESS],
+                "asset_ids": [123],
+                "keys": ["01", "7072696365"],
+                "templates": ["TMPL_APP"],
+                "dynamic": ["(Txna Accounts (Txn GroupIndex))"],
+            },
+            "price": {**EMPTY, "applications": [1], "asset_ids": [123], "keys": ["7072696365"]},
+        }
+    ]
+
+
+def test_footprint_implicit():
+    # test that references available without foreign arrays are not included
+    with ptmn.collect_footprint() as footprint:
+        compile(
+            ptmn.AcctParams(pt.Global.current_application_address(), "balance").get()
+            + ptmn.AppParams(pt.Global.current_application_id(), "global_num_uint").get()
+        )
+    assert json.loads(footprint.to_json()) == [{"main": EMPTY}]
+
+
+def test_footprint_transitive():
+    # test that the reads of nested subroutines are included in the footprint of their callers
+    @pt.Subroutine(pt.TealType.uint64)
+    def balance():
+        return ptmn.AcctParams(pt.Txn.accounts[1], "balance").get()
+
+    @pt.Subroutine(pt.TealType.uint64)
+    def total():
+        return balance() + ptmn.AssetHolding(pt.Txn.accounts[1], pt.Txn.assets[0], "balance").get()
+
+    @pt.Subroutine(pt.TealType.uint64)
+    def method():
+        return total()
+
+    with ptmn.collect_footprint() as footprint:
+        compile(method())
+
+    program = footprint.programs[0]
+    assert program.calls == {"main": {"method"}, "method": {"total"}, "total": {"balance"}}
+    assert program.subroutines["total"].to_dict() == {**EMPTY, "accounts": [1], "assets": [0]}
+    assert program.footprint("method").to_dict() == {**EMPTY, "accounts": [1], "assets": [0]}
+    assert json.loads(footprint.to_json())[0]["balance"] == {**EMPTY, "accounts": [1]}
+
+
+def test_footprint_restores_calls():
+    # test that subroutine calls are only wrapped while collecting
+    teal = pt.SubroutineCall.__teal__
+    with ptmn.collect_footprint():
+        assert pt.SubroutineCall.__teal__ is not teal
+        with ptmn.collect_footprint():
+            pass
+        assert pt.SubroutineCall.__teal__ is not teal
+    assert pt.SubroutineCall.__teal__ is teal
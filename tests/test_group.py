@@ -0,0 +1,76 @@
+import pyteal as pt
+import pytest
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, format_teal
+
+
+def price() -> ptmn.ExAppGlobal:
+    return ptmn.ExAppGlobal(pt.Txn.applications[1], pt.Bytes("price"), pt.TealType.uint64, slot=10)
+
+
+def test_cache_pinned():
+    # test that the cached value is stored in the pinned slot, unaffected by other allocations
+    reader = price()
+    teal = compile(pt.ScratchVar().store(pt.Int(1)), reader.cache(), reader.get())
+    assert teal == format_teal(
+        """
+        int 1
+        store 0
+        txna Applications 1
+        byte "price"
+        app_global_get_ex
+        assert
+        store 10
+        load 10
+        return
+        """
+    )
+
+
+def test_gload():
+    teal = compile(price().gload(0) + price().gload(pt.Txn.group_index() - pt.Int(1)))
+    assert teal == format_teal(
+        """
+        gload 0 10
+        txn GroupIndex
+        int 1
+        -
+        gloads 10
+        +
+        return
+        """
+    )
+
+
+def test_gload_unpinned():
+    with pytest.raises(ValueError):
+        ptmn.AssetParams(pt.Txn.assets[0], "decimals").gload(0)
+
+
+def test_pin_out_of_range():
+    with pytest.raises(ValueError):
+        ptmn.AssetParams(pt.Txn.assets[0], "decimals", slot=256)
+
+
+def test_gload_type():
+    # test that the loaded value is typed as the reader value
+    assert price().gload(0).type_of() == pt.TealType.uint64
+    with pytest.raises(pt.TealTypeError):
+        pt.Len(price().gload(0))
+
+
+def test_verify_group():
+    reader = price()
+    ptmn.verify_group(compile(reader.cache(), reader.get()), price())
+    ptmn.verify_group(compile(price().exists()), price())
+
+
+def test_verify_group_missing():
+    # test that reading without caching, or caching another reader in the slot, is rejected
+    with pytest.raises(ValueError, match="slot 10"):
+        ptmn.verify_group(compile(price().get()), price())
+    other = ptmn.AssetParams(pt.Txn.assets[0], "decimals", slot=10)
+    with pytest.raises(ValueError, match="slot 10"):
+        ptmn.verify_group(compile(other.cache(), other.get()), price())
@@ -0,0 +1,111 @@
+import pyteal as pt
+import pytest
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, format_teal
+
+
+def test_indexed_constant():
+    # test that constant keys are folded into a single byte string
+    for prefix in ("p_", b"p_", pt.Bytes("p_"), pt.Bytes("base16", "0x705f"), pt.Bytes("base64", "cF8=")):
+        for index in (3, pt.Int(3)):
+            element = ptmn.ExAppGlobal.indexed(pt.Txn.applications[1], prefix, index, pt.TealType.uint64)
+            teal = compile(element.get())
+            assert teal == format_teal(
+                """
+                txna Applications 1
+                byte 0x705f0000000000000003
+                app_global_get_ex
+                assert
+                return
+                """
+            )
+
+
+def test_indexed_dynamic():
+    element = ptmn.ExAppGlobal.indexed(pt.Txn.applications[1], "p_", pt.Txn.group_index(), pt.TealType.uint64)
+    teal = compile(element.get())
+    assert teal == format_teal(
+        """
+        txna Applications 1
+        byte "p_"
+        txn GroupIndex
+        itob
+        concat
+        app_global_get_ex
+        assert
+        return
+        """
+    )
+
+
+def test_indexed_range():
+    total = pt.ScratchVar(pt.TealType.uint64)
+    teal = compile(
+        total.store(pt.Int(0)),
+        ptmn.ExAppGlobal.indexed_range(
+            pt.Txn.applications[1],
+            "p_",
+            0,
+            4,
+            lambda element: total.store(total.load() + element.get()),
+            pt.TealType.uint64,
+        ),
+        total.load(),
+    )
+    assert teal == format_teal(
+        """
+        int 0
+        store 0
+        int 0
+        store 1
+        main_l1:
+        load 1
+        int 4
+        <
+        bz main_l3
+        load 0
+        txna Applications 1
+        byte "p_"
+        load 1
+        itob
+        concat
+        app_global_get_ex
+        assert
+        +
+        store 0
+        load 1
+        int 1
+        +
+        store 1
+        b main_l1
+        main_l3:
+        load 0
+        return
+        """
+    )
+
+
+def test_indexed_out_of_range():
+    for prefix in ("p_", pt.Txn.note()):
+        for index in (-1, 2**64):
+            with pytest.raises(ValueError):
+                ptmn.ExAppGlobal.indexed(pt.Txn.applications[1], prefix, index)
+    with pytest.raises(ValueError):
+        ptmn.ExAppGlobal.indexed_range(pt.Txn.applications[1], "p_", -1, 4, lambda element: pt.Pop(element.get()))
+
+
+def test_indexed_forwarded():
+    # test that the pinned slot and cache policy are passed on to the element readers
+    policy = ptmn.CachePolicy()
+    element = ptmn.ExAppGlobal.indexed(pt.Txn.applications[1], "p_", 3, slot=5, policy=policy)
+    assert (element.slot, element.policy) == (5, policy)
+    elements: list[ptmn.ExAppGlobal] = []
+
+    def body(element: ptmn.ExAppGlobal) -> pt.Expr:
+        elements.append(element)
+        return pt.Pop(element.get())
+
+    ptmn.ExAppGlobal.indexed_range(pt.Txn.applications[1], "p_", 0, 4, body, slot=5, policy=policy)
+    assert (elements[0].slot, elements[0].policy) == (5, policy)
@@ -0,0 +1,54 @@
+import json
+
+import pyteal as pt
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, compile_popped
+
+
+def test_metrics_per_program():
+    with ptmn.collect_metrics() as metrics:
+        balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+        compile(pt.If(balance.exists(), balance.get(), ptmn.AcctParams(pt.Txn.sender(), "balance").get()))
+        compile_popped(ptmn.AssetParams(pt.Txn.assets[0], "name").get(assert_exists=False))
+
+    assert json.loads(metrics.to_json()) == [
+        {
+            "reads": {"asset_holding_get": 1, "acct_params_get": 1},
+            "cache_hits": 1,
+            "cache_misses": 1,
+            "slots": 1,
+            "asserts": 1,
+        },
+        {
+            "reads": {"asset_params_get": 1},
+            "cache_hits": 0,
+            "cache_misses": 1,
+            "slots": 0,
+            "asserts": 0,
+        },
+    ]
+
+
+def test_metrics_outside_context():
+    # test that compiling after the context has been exited is not recorded
+    with ptmn.collect_metrics() as metrics:
+        pass
+    compile(ptmn.AcctParams(pt.Txn.sender(), "balance").get())
+    assert metrics.programs == []
+
+
+def test_metrics_cache():
+    # test that reads cached by cache() are not counted as misses
+    with ptmn.collect_metrics() as metrics:
+        balance = ptmn.AcctParams(pt.Txn.sender(), "balance")
+        compile(balance.cache(), balance.get())
+
+    assert metrics.programs[0].to_dict() == {
+        "reads": {"acct_params_get": 1},
+        "cache_hits": 1,
+        "cache_misses": 0,
+        "slots": 1,
+        "asserts": 1,
+    }
@@ -0,0 +1,256 @@
+import textwrap
+
+from pyteal_maybenot.migrate import main, program_size, rewrite
+
+from .utils import compile, format_teal
+
+
+def dedent(source: str) -> str:
+    return textwrap.dedent(source[1:])
+
+
+def test_rewrite_assert():
+    result = rewrite(
+        dedent(
+            """
+            import pyteal as pt
+
+
+            def program():
+                balance = pt.AssetHolding.balance(pt.Txn.sender(), pt.Txn.assets[0])
+                return pt.Seq(
+                    balance,
+                    pt.Assert(balance.hasValue()),
+                    balance.value(),
+                )
+            """
+        )
+    )
+    assert result.rewritten == 1
+    assert result.source == dedent(
+        """
+        import pyteal as pt
+        import pyteal_maybenot as ptmn
+
+
+        def program():
+            balance = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[0], "balance")
+            return pt.Seq(
+                balance.get(),
+            )
+        """
+    )
+    namespace: dict = {}
+    exec(result.source, namespace)
+    assert compile(namespace["program"]()) == format_teal(
+        """
+        txn Sender
+        txna Assets 0
+        asset_holding_get AssetBalance
+        assert
+        return
+        """
+    )
+
+
+def test_rewrite_if():
+    result = rewrite(
+        dedent(
+            """
+            import pyteal as pt
+            import pyteal_maybenot as mn
+
+            status = pt.App.globalGetEx(pt.Txn.applications[1], pt.Bytes("status"))
+            decimals = pt.AssetParam.decimals(pt.Txn.assets[0])
+            program = pt.Seq(
+                [status, decimals, pt.If(status.hasValue(), status.value(), pt.Int(0)) + decimals.value()]
+            )
+            """
+        )
+    )
+    assert result.rewritten == 2
+    assert result.source == dedent(
+        """
+        import pyteal as pt
+        import pyteal_maybenot as mn
+
+        status = mn.ExAppGlobal(pt.Txn.applications[1], pt.Bytes("status"))
+        decimals = mn.AssetParams(pt.Txn.assets[0], "decimals")
+        program = pt.Seq(
+            [status.get_or(pt.Int(0)) + decimals.get(assert_exists=False)]
+        )
+        """
+    )
+
+
+def test_skip_unsupported():
+    source = dedent(
+        """
+        import pyteal as pt
+
+        creator = pt.AppParam.creator(pt.Txn.applications[1])
+        total = pt.AccountParam.totalAssets(pt.Txn.sender())
+        program = pt.Seq(creator, pt.Pop(creator.outputReducer(lambda value, has_value: value)), pt.Int(1))
+        """
+    )
+    result = rewrite(source)
+    assert result.rewritten == 0
+    assert result.skipped == [
+        (3, "unsupported use outputReducer() of creator"),
+        (4, "no reader for AccountParam.totalAssets"),
+    ]
+    assert result.source == source
+
+
+def test_program_size():
+    teal = "\n".join(
+        [
+            "#pragma version 7",
+            "intcblock 300 1",
+            "bytecblock 0x616263",
+            'bytec_0 // "abc"',
+            "txna Assets 0",
+            "asset_params_get AssetDecimals",
+            "bnz main_l2",
+            "pushint 1000 // 1000",
+            "main_l2:",
+            "return",
+        ]
+    )
+    # version 1, intcblock 5, bytecblock 6, bytec_0 1, txna 3, asset_params_get 2, bnz 3, pushint 3, return 1
+    assert program_size(teal) == (8, 25)
+
+
+def test_rewrite_assert_only():
+    # test that the existence check is kept if no following get() asserts
+    result = rewrite(
+        dedent(
+            """
+            import pyteal as pt
+
+            status = pt.App.globalGetEx(pt.Txn.applications[1], pt.Bytes("status"))
+            program = pt.Seq(status, pt.Assert(status.hasValue()), pt.Int(1))
+            """
+        )
+    )
+    assert result.rewritten == 1
+    assert result.source == dedent(
+        """
+        import pyteal as pt
+        import pyteal_maybenot as ptmn
+
+        status = ptmn.ExAppGlobal(pt.Txn.applications[1], pt.Bytes("status"))
+        program = pt.Seq(pt.Assert(status.exists(store=False)), pt.Int(1))
+        """
+    )
+    namespace: dict = {}
+    exec(result.source, namespace)
+    assert compile(namespace["program"]) == format_teal(
+        """
+        txna Applications 1
+        byte "status"
+        app_global_get_ex
+        swap
+        pop
+        assert
+        int 1
+        return
+        """
+    )
+
+
+def test_skip_nested_scope():
+    source = dedent(
+        """
+        import pyteal as pt
+
+        decimals = pt.AssetParam.decimals(pt.Txn.assets[0])
+        value = lambda: decimals.value()
+
+
+        def program():
+            return pt.Seq(decimals, value())
+        """
+    )
+    result = rewrite(source)
+    assert result.rewritten == 0
+    assert result.skipped == [(3, "decimals used in a nested scope")]
+    assert result.source == source
+
+
+def test_main_compile_failure(tmp_path, capsys):
+    # test that compile failures are reported per file, leaving the file untouched
+    path = tmp_path / "contract.py"
+    source = dedent(
+        """
+        import pyteal as pt
+
+
+        def program():
+            decimals = pt.AssetParam.decimals(pt.Txn.assets[0])
+            return pt.Seq(decimals, pt.Assert(decimals.hasValue()), decimals.value())
+
+
+        def broken():
+            raise ValueError("broken")
+        """
+    )
+    path.write_text(source)
+    assert main(["--write", "--compile", "broken", str(path)]) == 1
+    assert capsys.readouterr().out == f"{path}: 1 rewritten, 0 skipped\n  broken: compile failed: ValueError: broken\n"
+    assert path.read_text() == source
+
+
+def test_rewrite_value_outside_assert():
+    # test that value() calls not following the assert are neither asserting nor keeping the assert
+    result = rewrite(
+        dedent(
+            """
+            import pyteal as pt
+
+            decimals = pt.AssetParam.decimals(pt.Txn.assets[0])
+            program = pt.Seq(decimals, pt.Pop(decimals.value()), pt.Assert(decimals.hasValue()), pt.Int(1))
+            nested = pt.Seq(decimals, pt.Seq(pt.Assert(decimals.hasValue()), pt.Int(1)), decimals.value())
+            """
+        )
+    )
+    assert result.rewritten == 1
+    assert result.source == dedent(
+        """
+        import pyteal as pt
+        import pyteal_maybenot as ptmn
+
+        decimals = ptmn.AssetParams(pt.Txn.assets[0], "decimals")
+        program = pt.Seq(pt.Pop(decimals.get(assert_exists=False)), pt.Assert(decimals.exists(store=False)), pt.Int(1))
+        nested = pt.Seq(pt.Seq(pt.Assert(decimals.exists(store=False)), pt.Int(1)), decimals.get(assert_exists=False))
+        """
+    )
+
+
+def test_skip_state_change():
+    # test that bindings are skipped if moving the read to its uses could change the value read
+    source = dedent(
+        """
+        import pyteal as pt
+
+        i = pt.ScratchVar()
+        balance = pt.AssetHolding.balance(pt.Txn.sender(), pt.Txn.assets[0])
+        holding = pt.AssetHolding.balance(pt.Txn.accounts[i.load()], pt.Txn.assets[0])
+        program = pt.Seq(
+            balance,
+            pt.InnerTxnBuilder.Execute({pt.TxnField.type_enum: pt.TxnType.AssetTransfer}),
+            pt.Assert(balance.hasValue()),
+            i.store(pt.Int(0)),
+            holding,
+            i.store(pt.Int(1)),
+            balance.value() + holding.value(),
+        )
+        """
+    )
+    result = rewrite(source)
+    assert result.rewritten == 0
+    assert result.skipped == [
+        (4, "state may change between evaluating balance and its use on line 9"),
+        (5, "state may change between evaluating holding and its use on line 13"),
+    ]
+    assert result.source == source
@@ -0,0 +1,162 @@
+import json
+
+import pyteal as pt
+import pytest
+
+import pyteal_maybenot as ptmn
+
+from .utils import compile, format_teal
+
+
+def test_policy():
+    policy = ptmn.CachePolicy()
+    decimals = ptmn.AssetParams(pt.Txn.assets[0], "decimals", policy=policy)
+    balance = ptmn.AcctParams(pt.Txn.sender(), "balance", policy=policy)
+    teal = compile(
+        pt.Assert(decimals.exists()),
+        pt.Assert(balance.exists()),
+        # only the value read again is cached
+        decimals.get(),
+    )
+    assert teal == format_teal(
+        """
+        txna Assets 0
+        asset_params_get AssetDecimals
+        swap
+        store 0
+        assert
+        txn Sender
+        acct_params_get AcctBalance
+        swap
+        pop
+        assert
+        load 0
+        return
+        """
+    )
+
+
+def test_policy_budget():
+    policy = ptmn.CachePolicy(budget=1)
+    decimals = ptmn.AssetParams(pt.Txn.assets[0], "decimals", policy=policy)
+    total = ptmn.AssetParams(pt.Txn.assets[pt.Txn.group_index()], "total", policy=policy)
+    teal = compile(
+        pt.Assert(decimals.exists()),
+        pt.Assert(total.exists()),
+        # the value with the more expensive arguments is cached
+        pt.Pop(decimals.get()),
+        total.get(),
+    )
+    assert teal == format_teal(
+        """
+        txna Assets 0
+        asset_params_get AssetDecimals
+        swap
+        pop
+        assert
+        txn GroupIndex
+        txnas Assets
+        asset_params_get AssetTotal
+        swap
+        store 0
+        assert
+        txna Assets 0
+        asset_params_get AssetDecimals
+        assert
+        pop
+        load 0
+        return
+        """
+    )
+    assert json.loads(policy.to_json()) == [
+        {
+            "reader": "asset_params_get AssetDecimals (Txna Assets 0)",
+            "reads": 1,
+            "cost": 1,
+            "savings": 2,
+            "cached": False,
+        },
+        {
+            "reader": "asset_params_get AssetTotal (Txna Assets (Txn GroupIndex))",
+            "reads": 1,
+            "cost": 2,
+            "savings": 3,
+            "cached": True,
+        },
+    ]
+
+
+def test_policy_chain():
+    # test that slots of values not cached are not filled on early exit
+    policy = ptmn.CachePolicy()
+    decimals = ptmn.AssetParams(pt.Txn.assets[0], "decimals", policy=policy)
+    total = ptmn.AssetParams(pt.Txn.assets[1], "total", policy=policy)
+    teal = compile(ptmn.all_exist(decimals, total))
+    assert teal == format_teal(
+        """
+        txna Assets 0
+        asset_params_get AssetDecimals
+        swap
+        pop
+        dup
+        bz main_l2
+        pop
+        txna Assets 1
+        asset_params_get AssetTotal
+        swap
+        pop
+        main_l2:
+        return
+        """
+    )
+
+
+def test_policy_invalid_budget():
+    with pytest.raises(ValueError):
+        ptmn.CachePolicy(budget=257)
+
+
+def test_policy_all_exist_fills():
+    # test that exits before a reader not cached by its policy still fill the slots of later readers
+    policy = ptmn.CachePolicy()
+    decimals = ptmn.AssetParams(pt.Txn.assets[0], "decimals")
+    balance = ptmn.AcctParams(pt.Txn.sender(), "balance", policy=policy)
+    holding = ptmn.AssetHolding(pt.Txn.sender(), pt.Txn.assets[1], "balance", policy=policy)
+    teal = compile(pt.If(ptmn.all_exist(decimals, balance, holding), holding.get(), pt.Int(0)))
+    assert teal == format_teal(
+        """
+        txna Assets 0
+        asset_params_get AssetDecimals
+        swap
+        store 0
+        dup
+        bnz main_l5
+        main_l1:
+        int 0
+        store 1
+        main_l2:
+        bnz main_l4
+        int 0
+        b main_l7
+        main_l4:
+        load 1
+        b main_l7
+        main_l5:
+        pop
+        txn Sender
+        acct_params_get AcctBalance
+        swap
+        pop
+        dup
+        bz main_l1
+        pop
+        txn Sender
+        txna Assets 1
+        asset_holding_get AssetBalance
+        swap
+        store 1
+        b main_l2
+        main_l7:
+        return
+        """
+    )
@@ -0,0 +1,94 @@
+import pyteal as pt
+import pytest
+from algosdk import encoding
+
+import pyteal_maybenot as ptmn
+
+from .utils import TEAL_VERSION, format_teal
+
+ADDRESS = encoding.encode_address(bytes(range(32)))
+
+
+def program() -> pt.Expr:
+    return pt.Seq(
+        pt.Pop(ptmn.AssetParams(pt.Tmpl.Int("TMPL_ASSET"), "decimals").get()),
+        pt.Pop(ptmn.ExAppGlobal(pt.Tmpl.Int("TMPL_APP"), pt.Tmpl.Bytes("TMPL_KEY")).get()),
+        pt.Pop(pt.Tmpl.Addr("TMPL_ADDR")),
+        pt.Tmpl.Int("TMPL_ASSET"),
+    )
+
+
+def values(asset: int) -> dict:
+    return {"TMPL_ASSET": asset, "TMPL_APP": 7, "TMPL_KEY": b"key", "TMPL_ADDR": ADDRESS}
+
+
+def test_render():
+    template = ptmn.Template(pt.compileTeal(program(), mode=pt.Mode.Application, version=TEAL_VERSION))
+    assert template.names == {"TMPL_ASSET", "TMPL_APP", "TMPL_KEY", "TMPL_ADDR"}
+    for asset in range(3):
+        assert template.render(values(asset)) == format_teal(
+            f"""
+            int {asset}
+            asset_params_get AssetDecimals
+            assert
+            pop
+            int 7
+            byte 0x6b6579
+            app_global_get_ex
+            assert
+            pop
+            addr {ADDRESS}
+            pop
+            int {asset}
+            return
+            """
+        )
+
+
+def test_render_assembled_constants():
+    teal = pt.compileTeal(program(), mode=pt.Mode.Application, version=TEAL_VERSION, assembleConstants=True)
+    assert ptmn.Template(teal).render(values(5)) == format_teal(
+        f"""
+        intcblock 5
+        intc_0 // TMPL_ASSET
+        asset_params_get AssetDecimals
+        assert
+        pop
+        pushint 7 // TMPL_APP
+        pushbytes 0x6b6579 // TMPL_KEY
+        app_global_get_ex
+        assert
+        pop
+        pushbytes 0x{bytes(range(32)).hex()} // TMPL_ADDR
+        pop
+        intc_0 // TMPL_ASSET
+        return
+        """
+    )
+
+
+def test_render_invalid_values():
+    template = ptmn.Template(pt.compileTeal(program(), mode=pt.Mode.Application, version=TEAL_VERSION))
+    with pytest.raises(ValueError):
+        template.render({**values(1), "TMPL_OTHER": 1})
+    with pytest.raises(ValueError):
+        template.render({"TMPL_ASSET": 1})
+    with pytest.raises(TypeError):
+        template.render({**values(1), "TMPL_ASSET": b"1"})
+    with pytest.raises(TypeError):
+        template.render({**values(1), "TMPL_ASSET": True})
+    with pytest.raises(ValueError):
+        template.render({**values(1), "TMPL_ASSET": -5})
+    with pytest.raises(ValueError):
+        template.render({**values(1), "TMPL_ASSET": 2**64})
+
+
+def test_render_invalid_strings():
+    # test that strings are only accepted as addresses, and only for placeholders which may be addresses
+    template = ptmn.Template(pt.compileTeal(program(), mode=pt.Mode.Application, version=TEAL_VERSION))
+    for name, value in [("TMPL_KEY", ADDRESS), ("TMPL_ADDR", "price")]:
+        with pytest.raises(TypeError, match=name):
+            template.render({**values(1), name: value})
+    teal = pt.compileTeal(program(), mode=pt.Mode.Application, version=TEAL_VERSION, assembleConstants=True)
+    with pytest.raises(TypeError, match="TMPL_KEY"):
+        ptmn.Template(teal).render({**values(1), "TMPL_KEY": "price"})